@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop_thread: Optional["AsyncLoopThread"] = None
+_loop_thread_lock = threading.Lock()
+
+
+class AsyncLoopThread:
+    """
+    Runs one asyncio event loop in a background thread for synchronous callers.
+
+    Submitting coroutines to a long-lived loop avoids creating and tearing
+    down a loop per call (as asyncio.run does), and lets calls from several
+    threads overlap on the same loop.
+    """
+
+    def __init__(self):
+        """Start the event loop in a daemon thread."""
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever,
+                                        name="mcp-async-loop", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """
+        Schedule a coroutine on the loop.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Future that resolves to the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        return self.submit(coro).result()
+
+
+def get_loop_thread() -> AsyncLoopThread:
+    """
+    Return the shared loop thread, starting it on first use.
+
+    Returns:
+        The process-wide AsyncLoopThread
+    """
+    global _loop_thread
+
+    if _loop_thread is None:
+        with _loop_thread_lock:
+            if _loop_thread is None:
+                _loop_thread = AsyncLoopThread()
+    return _loop_thread
+
+
+class LoopLocal(Generic[T]):
+    """
+    Holds one value per running event loop, created on first use.
+
+    asyncio primitives (Lock, Semaphore, ...) bind to the first loop that
+    waits on them and fail on any other, so module-level ones cannot be
+    shared by the server's loop and the loop thread above.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        """
+        Args:
+            factory: Called with the loop running to create its value
+        """
+        self._factory = factory
+        self._values: Dict[asyncio.AbstractEventLoop, T] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """
+        Return the value for the running event loop.
+
+        Returns:
+            The running loop's value, created if this is its first use
+        """
+        loop = asyncio.get_running_loop()
+        value = self._values.get(loop)
+        if value is None:
+            with self._lock:
+                value = self._values.get(loop)
+                if value is None:
+                    # Drop values for loops that have closed since (each
+                    # asyncio.run call leaves one behind)
+                    for closed in [other for other in self._values if other.is_closed()]:
+                        del self._values[closed]
+                    value = self._values[loop] = self._factory()
+        return value
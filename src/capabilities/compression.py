@@ -1,26 +1,346 @@
-import gzip
-import zlib
-import base64
+import asyncio
+import codecs
 import os
 import logging
-import random
-from typing import Dict, Any, Optional
+import multiprocessing
+import re
+import stat
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Any, Iterator, NamedTuple, Optional, Tuple
+
+try:
+    # ISA-L backed drop-ins (vectorized LZ77 matching and CRC32)
+    from isal import igzip as gzip, isal_zlib as zlib
+    _MAX_COMPRESSLEVEL = zlib.ISAL_BEST_COMPRESSION
+    _FILE_COMPRESSLEVEL = zlib.ISAL_DEFAULT_COMPRESSION
+except ImportError:  # pragma: no cover - stdlib fallback for portability
+    import gzip
+    import zlib
+    _MAX_COMPRESSLEVEL = 9
+    _FILE_COMPRESSLEVEL = 6
+
+try:
+    # SIMD-accelerated base64 (SSSE3/AVX2/AVX-512/NEON with runtime dispatch)
+    from pybase64 import b64encode_as_string as _b64encode, b64decode as _b64decode
+except ImportError:  # pragma: no cover - stdlib fallback for portability
+    import base64
+
+    def _b64encode(data: bytes) -> str:
+        # Base64 output is pure ASCII, so skip the UTF-8 validator
+        return base64.b64encode(data).decode('ascii')
+
+    _b64decode = base64.b64decode
+
+try:
+    # Binds libzstd (BMI2 bit manipulation, vectorized Huffman decoding)
+    import zstandard as zstd
+except ImportError:  # pragma: no cover - zstd support is optional
+    zstd = None
 
 logger = logging.getLogger(__name__)
 
+# Block size for streaming file compression (128 KiB)
+_IO_BLOCK_SIZE = 1 << 17
+
+# Payloads above this size (1 MiB by default) are sent to a process pool to
+# escape the GIL; below it, pickling and IPC cost more than the thread pool
+_PROCESS_POOL_THRESHOLD = int(os.environ.get("MCP_PROCESS_POOL_THRESHOLD", 1 << 20))
+
+# Each uvicorn worker has its own pool, so together they share the cores
+_PROCESS_POOL_WORKERS = max(1, (os.cpu_count() or 1)
+                            // int(os.environ.get("MCP_WORKERS") or 1))
+
+# Base64 characters decoded per step when decompressing (a multiple of 4)
+_B64_CHUNK_CHARS = 64 * 1024
+
+# Characters a non-validating base64 decode skips over
+_B64_NON_ALPHABET = re.compile(r"[^A-Za-z0-9+/=]+")
+
+# Number of compressed bytes that encode to exactly 100 base64 characters
+_PREVIEW_RAW_BYTES = 75
+_PREVIEW_CHARS = 100
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+class _Codec(NamedTuple):
+    """One-shot and streaming entry points for a compression algorithm."""
+    compress: Callable[[bytes, int], bytes]
+    compressobj: Callable[[int], Any]
+    decompressobj: Callable[[], Any]
+    extension: str
+    max_level: int
+    # Whether several compressed streams may be concatenated (gzip members,
+    # zstd frames); otherwise data after the end of the stream is ignored
+    multi_stream: bool
+
+
+# Supported algorithms, keyed by casefolded name
+_ALGOS: Dict[str, _Codec] = {
+        "gzip": _Codec(gzip.compress,
+                       lambda level: zlib.compressobj(level, zlib.DEFLATED, 31),
+                       lambda: zlib.decompressobj(31), ".gz", _MAX_COMPRESSLEVEL, True),
+        "zlib": _Codec(zlib.compress, zlib.compressobj, zlib.decompressobj, ".zz",
+                       _MAX_COMPRESSLEVEL, False)
+        }
+
+if zstd is not None:
+    # zstd contexts are not safe to share between threads, so each worker
+    # thread (or process) keeps its own for one-shot compression and reuses
+    # it across calls
+    _zstd_contexts = threading.local()
+
+    def _zstd_compressor(level: int) -> "zstd.ZstdCompressor":
+        compressors = _zstd_contexts.__dict__.setdefault("compressors", {})
+        compressor = compressors.get(level)
+        if compressor is None:
+            compressor = compressors[level] = zstd.ZstdCompressor(level=level)
+        return compressor
+
+    # zstd frames are binary, so they round-trip through the base64 wrapper
+    # like gzip/zlib output. decompressobj handles frames without a content size.
+    # Streaming objects share their parent's context and a stream can pause
+    # between worker-thread steps, so each one gets a fresh parent.
+    _ALGOS["zstd"] = _Codec(lambda data, level: _zstd_compressor(level).compress(data),
+                            lambda level: zstd.ZstdCompressor(level=level).compressobj(),
+                            lambda: zstd.ZstdDecompressor().decompressobj(),
+                            ".zst", zstd.MAX_COMPRESSION_LEVEL, True)
+
+
+def _get_codec(algorithm: str) -> _Codec:
+    """
+    Look up the codec for an algorithm name.
+
+    Args:
+        algorithm: Compression algorithm name (case-insensitive)
+
+    Returns:
+        The matching codec
+    """
+    try:
+        return _ALGOS[algorithm.casefold()]
+    except KeyError:
+        raise ValueError(f"Unsupported compression algorithm: {algorithm}") from None
+
+
+def _compress_payload(data_bytes: bytes, algorithm: str, compresslevel: int,
+                      include_full_data: bool) -> Tuple[int, str, Optional[str]]:
+    """
+    Compress bytes and base64 encode the result.
+
+    The full buffer is encoded only when it was asked for; otherwise a preview
+    is encoded from the first 75 compressed bytes only.
+
+    Args:
+        data_bytes: The data to compress
+        algorithm: Compression algorithm to use (gzip, zlib or zstd)
+        compresslevel: Compression level to use
+        include_full_data: Whether to base64 encode the full compressed data
+
+    Returns:
+        Tuple of (compressed size in bytes, base64 preview or None, full base64 data or None)
+    """
+    compressed_bytes = _get_codec(algorithm).compress(data_bytes, compresslevel)
+
+    compressed_size = len(compressed_bytes)
+    if include_full_data:
+        return compressed_size, None, _b64encode(compressed_bytes)
+
+    # Slice through a memoryview and append the marker in one f-string, so
+    # the preview costs a single string allocation
+    if compressed_size > _PREVIEW_RAW_BYTES:
+        preview = f"{_b64encode(memoryview(compressed_bytes)[:_PREVIEW_RAW_BYTES])}..."
+    else:
+        preview = _b64encode(compressed_bytes)
+
+    return compressed_size, preview, None
+
+
+def _iter_decompressed(compressed_data_b64: str, algorithm: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    Incrementally base64 decode, decompress and UTF-8 decode data.
+
+    Works through the input 64 KiB of base64 at a time, so only one chunk of
+    compressed and decompressed bytes is alive at once rather than the whole
+    payload at each stage.
+
+    Args:
+        compressed_data_b64: Base64-encoded compressed data
+        algorithm: Compression algorithm used (gzip, zlib or zstd)
+
+    Yields:
+        Tuples of (compressed bytes consumed, decompressed bytes produced, text)
+    """
+    codec = _get_codec(algorithm)
+
+    # Chunk boundaries must fall on 4-character groups, so drop everything a
+    # whole-string decode would skip (line breaks in MIME-wrapped input, stray
+    # characters) up front rather than letting it shift later chunks
+    if _B64_NON_ALPHABET.search(compressed_data_b64):
+        compressed_data_b64 = _B64_NON_ALPHABET.sub("", compressed_data_b64)
+
+    decompressor = codec.decompressobj()
+    decoder = codecs.getincrementaldecoder('utf-8')()
+
+    for start in range(0, len(compressed_data_b64), _B64_CHUNK_CHARS):
+        compressed = _b64decode(compressed_data_b64[start:start + _B64_CHUNK_CHARS], validate=False)
+        # A stream that ended exactly on the previous chunk boundary left no
+        # unused data behind, so the next stream starts with this chunk
+        if codec.multi_stream and decompressor.eof:
+            decompressor = codec.decompressobj()
+        decompressed = decompressor.decompress(compressed)
+        while codec.multi_stream and decompressor.eof and decompressor.unused_data:
+            remaining = decompressor.unused_data
+            decompressor = codec.decompressobj()
+            decompressed += decompressor.decompress(remaining)
+        yield len(compressed), len(decompressed), decoder.decode(decompressed)
+
+    if not decompressor.eof:
+        raise ValueError("Compressed data ended before the end of the stream")
+
+    yield 0, 0, decoder.decode(b"", final=True)
+
+
+def _decompress_payload(compressed_data_b64: str, algorithm: str) -> Tuple[int, int, str, str]:
+    """
+    Base64 decode and decompress data back into a string.
+
+    Args:
+        compressed_data_b64: Base64-encoded compressed data
+        algorithm: Compression algorithm used (gzip, zlib or zstd)
+
+    Returns:
+        Tuple of (compressed size, decompressed size, preview, decompressed string)
+    """
+    compressed_size = decompressed_size = 0
+    parts = []
+    for compressed_len, decompressed_len, text in _iter_decompressed(compressed_data_b64, algorithm):
+        compressed_size += compressed_len
+        decompressed_size += decompressed_len
+        parts.append(text)
+
+    decompressed_data = "".join(parts)
+    if len(decompressed_data) > _PREVIEW_CHARS:
+        preview = f"{decompressed_data[:_PREVIEW_CHARS]}..."
+    else:
+        preview = decompressed_data
+
+    return compressed_size, decompressed_size, preview, decompressed_data
+
+
+def _stream_compress(file_path: str, output_path: str, algorithm: str) -> Tuple[int, int]:
+    """
+    Stream a file through the compressor in large blocks.
+
+    Large read/write buffers cut the syscall count and let zlib amortize
+    its per-call overhead, and peak memory stays at one block instead of
+    the whole file. Output goes to a temporary file that replaces the
+    output path only once compression succeeds, so a failure never leaves a
+    partial file behind. Takes the algorithm name rather than a codec so it
+    can run in the process pool.
+
+    Args:
+        file_path: Path to the file to compress
+        output_path: Path for the compressed output file
+        algorithm: Compression algorithm to use
+
+    Returns:
+        Tuple of (original size, compressed size) in bytes
+    """
+    compressor = _get_codec(algorithm).compressobj(_FILE_COMPRESSLEVEL)
+    temp_fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)),
+                                          prefix=f".{os.path.basename(output_path)}.",
+                                          suffix=".tmp")
+    try:
+        with open(file_path, 'rb', buffering=_IO_BLOCK_SIZE) as fin, \
+                open(temp_fd, 'wb', buffering=_IO_BLOCK_SIZE) as fout:
+            input_stat = os.fstat(fin.fileno())
+            while chunk := fin.read(_IO_BLOCK_SIZE):
+                fout.write(compressor.compress(chunk))
+            fout.write(compressor.flush())
+
+        # mkstemp creates the file owner-only; give it the input's permissions
+        os.chmod(temp_path, stat.S_IMODE(input_stat.st_mode))
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return input_stat.st_size, os.path.getsize(output_path)
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """
+    Pick how process pool workers are started.
+
+    The server already runs threads (log listener, to_thread pool) and
+    forking a threaded process can deadlock, so workers come from a fork
+    server that only preloads this module, or are spawned where fork servers
+    are unavailable.
+
+    Returns:
+        Multiprocessing context for the pool
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+async def _run_cpu_bound(payload_size: int, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run CPU-bound codec work off the event loop.
+
+    Small payloads run on the default thread pool (zlib releases the GIL while
+    compressing); large payloads go to a shared process pool so several can
+    use separate cores at once.
+    """
+    global _process_pool
+
+    if payload_size > _PROCESS_POOL_THRESHOLD:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=_PROCESS_POOL_WORKERS,
+                                                mp_context=_pool_context())
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_process_pool, func, *args)
+
+    return await asyncio.to_thread(func, *args)
+
 
 class CompressionHandler:
     """
     Handles compression operations as part of MCP capability.
     """
 
-    async def compress_data(self, data: str, algorithm: str = "gzip") -> Dict[str, Any]:
+    def __init__(self, base_path: str = "/data/samples"):
+        """
+        Initialize the compression handler.
+
+        Args:
+            base_path: Directory that files are compressed in; compress_file
+                reads and writes nothing outside it
+        """
+        self.base_path = base_path
+        self._real_base_path = os.path.realpath(base_path)
+
+    async def compress_data(self, data: str, algorithm: str = "gzip",
+                            compresslevel: int = 1,
+                            include_full_data: bool = False) -> Dict[str, Any]:
         """
         Compress a string using the specified algorithm.
 
         Args:
             data: The string data to compress
-            algorithm: Compression algorithm to use (gzip or zlib)
+            algorithm: Compression algorithm to use (gzip, zlib or zstd)
+            compresslevel: Compression level (default 1, favouring speed for
+                wire transport; 0-3 with ISA-L, 0-9 with stdlib zlib, up to 22
+                with zstd)
+            include_full_data: Return the full base64 encoded data instead of
+                a truncated preview
 
         Returns:
             Dictionary with compressed data information
@@ -28,47 +348,52 @@ class CompressionHandler:
         if not data:
             raise ValueError("Data cannot be empty")
 
+        codec = _get_codec(algorithm)
+        # Levels arrive straight from tool params, so reject anything that
+        # would only fail later (as a TypeError) inside the codec
+        if not isinstance(compresslevel, int) or isinstance(compresslevel, bool):
+            raise ValueError("Compression level must be an integer")
+        if not 0 <= compresslevel <= codec.max_level:
+            raise ValueError(f"Compression level must be between 0 and {codec.max_level}")
+
         # Convert string to bytes
         data_bytes = data.encode('utf-8')
         original_size = len(data_bytes)
 
         try:
-            # Compress using the specified algorithm
-            if algorithm.lower() == "gzip":
-                compressed_bytes = gzip.compress(data_bytes)
-            elif algorithm.lower() == "zlib":
-                compressed_bytes = zlib.compress(data_bytes)
-            else:
-                raise ValueError(f"Unsupported compression algorithm: {algorithm}")
+            compressed_size, preview_b64, compressed_b64 = await _run_cpu_bound(
+                    original_size, _compress_payload, data_bytes, algorithm, compresslevel,
+                    include_full_data)
 
             # Calculate compression ratio
-            compressed_size = len(compressed_bytes)
             compression_ratio = original_size / compressed_size if compressed_size > 0 else 0
 
-            # Base64 encode for JSON compatibility
-            compressed_b64 = base64.b64encode(compressed_bytes).decode('utf-8')
-
-            return {
+            result = {
                     "algorithm": algorithm,
                     "original_size_bytes": original_size,
                     "compressed_size_bytes": compressed_size,
-                    "compression_ratio": round(compression_ratio, 2),
-                    "compressed_data_b64": compressed_b64[:100] + "..." if len(compressed_b64) > 100 else compressed_b64,
-                    "full_compressed_data_b64": compressed_b64
+                    "compression_ratio": compression_ratio
                     }
+            if compressed_b64 is not None:
+                result["full_compressed_data_b64"] = compressed_b64
+            else:
+                result["compressed_data_b64"] = preview_b64
+
+            return result
         except Exception as e:
             logger.error(f"Error compressing data: {str(e)}")
             raise
 
     async def compress_file(self, file_path: str, output_path: Optional[str] = None, 
-                            algorithm: str = "gzip") -> Dict[str, Any]:
+                            algorithm: str = "gzip", overwrite: bool = False) -> Dict[str, Any]:
         """
         Compress a file using the specified algorithm.
 
         Args:
             file_path: Path to the file to compress
             output_path: Path for the compressed output file (optional)
-            algorithm: Compression algorithm to use (gzip or zlib)
+            algorithm: Compression algorithm to use (gzip, zlib or zstd)
+            overwrite: Replace the output file if it already exists
 
         Returns:
             Dictionary with compressed file information
@@ -76,24 +401,29 @@ class CompressionHandler:
         if not file_path:
             raise ValueError("File path cannot be empty")
 
+        codec = _get_codec(algorithm)
+
+        # Confine both paths before touching either file
+        file_path = self._resolve_path(file_path)
+
         # Determine output path if not provided
         if output_path is None:
-            if algorithm.lower() == "gzip":
-                output_path = f"{file_path}.gz"
-            elif algorithm.lower() == "zlib":
-                output_path = f"{file_path}.zz"
-            else:
-                raise ValueError(f"Unsupported compression algorithm: {algorithm}")
+            output_path = f"{file_path}{codec.extension}"
+        output_path = self._resolve_path(output_path)
 
-        # Simulate file existence check
-        if not self._simulate_file_exists(file_path):
+        if not os.path.isfile(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
+        if os.path.exists(output_path):
+            if os.path.samefile(output_path, file_path):
+                raise ValueError(f"Output path is the input file: {output_path}")
+            if not overwrite:
+                raise FileExistsError(f"Output file already exists: {output_path}")
+
         try:
-            # Simulate file sizes and compression ratio
-            original_size = random.randint(1000000, 10000000)  # 1-10 MB
-            compression_ratio = 3.5 if algorithm.lower() == "gzip" else 4.2  # Typical ratios
-            compressed_size = int(original_size / compression_ratio)
+            original_size, compressed_size = await _run_cpu_bound(
+                    os.path.getsize(file_path), _stream_compress, file_path, output_path, algorithm)
+            compression_ratio = original_size / compressed_size if compressed_size > 0 else 0
 
             return {
                     "algorithm": algorithm,
@@ -101,20 +431,40 @@ class CompressionHandler:
                     "compressed_file": output_path,
                     "original_size_bytes": original_size,
                     "compressed_size_bytes": compressed_size,
-                    "compression_ratio": round(compression_ratio, 2),
-                    "simulated": True
+                    "compression_ratio": compression_ratio
                     }
         except Exception as e:
             logger.error(f"Error compressing file: {str(e)}")
             raise
 
+    def _resolve_path(self, path: str) -> str:
+        """
+        Resolve a file path, confining it to the base path.
+
+        Relative paths are taken relative to the base path, and symlinks and
+        ".." components are resolved before the check.
+
+        Args:
+            path: Path supplied by the client
+
+        Returns:
+            The resolved path
+
+        Raises:
+            PermissionError: If the path resolves outside the base path
+        """
+        real_path = os.path.realpath(os.path.join(self.base_path, path))
+        if os.path.commonpath((self._real_base_path, real_path)) != self._real_base_path:
+            raise PermissionError(f"Path is outside {self.base_path}: {path}")
+        return real_path
+
     async def decompress_data(self, compressed_data_b64: str, algorithm: str = "gzip") -> Dict[str, Any]:
         """
         Decompress a base64-encoded compressed string.
 
         Args:
             compressed_data_b64: Base64-encoded compressed data
-            algorithm: Compression algorithm used (gzip or zlib)
+            algorithm: Compression algorithm used (gzip, zlib or zstd)
 
         Returns:
             Dictionary with decompressed data information
@@ -123,41 +473,39 @@ class CompressionHandler:
             raise ValueError("Compressed data cannot be empty")
 
         try:
-            # Decode base64 to bytes
-            compressed_bytes = base64.b64decode(compressed_data_b64)
-
-            # Decompress using the specified algorithm
-            if algorithm.lower() == "gzip":
-                decompressed_bytes = gzip.decompress(compressed_bytes)
-            elif algorithm.lower() == "zlib":
-                decompressed_bytes = zlib.decompress(compressed_bytes)
-            else:
-                raise ValueError(f"Unsupported compression algorithm: {algorithm}")
-
-            # Convert bytes back to string
-            decompressed_data = decompressed_bytes.decode('utf-8')
+            compressed_size, decompressed_size, preview, decompressed_data = await _run_cpu_bound(
+                    len(compressed_data_b64), _decompress_payload, compressed_data_b64, algorithm)
 
             return {
                     "algorithm": algorithm,
-                    "compressed_size_bytes": len(compressed_bytes),
-                    "decompressed_size_bytes": len(decompressed_bytes),
-                    "decompressed_data": decompressed_data[:100] + "..." if len(decompressed_data) > 100 else decompressed_data,
+                    "compressed_size_bytes": compressed_size,
+                    "decompressed_size_bytes": decompressed_size,
+                    "decompressed_data": preview,
                     "full_decompressed_data": decompressed_data
                     }
         except Exception as e:
             logger.error(f"Error decompressing data: {str(e)}")
             raise
 
-    def _simulate_file_exists(self, file_path: str) -> bool:
+    async def iter_decompress_data(self, compressed_data_b64: str,
+                                   algorithm: str = "gzip") -> AsyncIterator[str]:
         """
-        Simulate checking if a file exists.
+        Decompress a base64-encoded compressed string as a stream of text chunks.
+
+        Each chunk is decoded on a worker thread, so large payloads can be
+        streamed to a client without holding the whole result in memory.
 
         Args:
-            file_path: Path to the file
+            compressed_data_b64: Base64-encoded compressed data
+            algorithm: Compression algorithm used (gzip, zlib or zstd)
 
-        Returns:
-            True if the file exists (simulated), False otherwise
+        Yields:
+            Decompressed text chunks
         """
-        if "nonexistent" in file_path or not file_path:
-            return False
-        return True
+        if not compressed_data_b64:
+            raise ValueError("Compressed data cannot be empty")
+
+        chunks = _iter_decompressed(compressed_data_b64, algorithm)
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            if chunk[2]:
+                yield chunk[2]
@@ -1,24 +1,134 @@
 import h5py
 import os
 import glob
+import asyncio
+import threading
 import numpy as np
-from typing import Dict, Any, List, Optional, Union
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlsplit
 import logging
 import pathlib
+import weakref
+
+try:
+    import fsspec
+except ImportError:  # pragma: no cover - only needed for remote files
+    fsspec = None
 
 logger = logging.getLogger(__name__)
 
+# HDF5 raw-data chunk cache (128 MiB, prime slot count to spread hashes)
+_CHUNK_CACHE_BYTES = 128 << 20
+_CHUNK_CACHE_SLOTS = 10007
+
+# HDF5 page buffer size for files created with the paged strategy
+_PAGE_BUFFER_BYTES = 128 << 20
+
+# Read block size for remote files, coalescing many small HDF5 reads
+_REMOTE_BLOCK_SIZE = 8 << 20
+
+# Most HDF5 files kept open at once; the least recently used is closed
+_MAX_OPEN_FILES = 32
+
+# Remote locations HDF5 files may be read from, as comma-separated
+# scheme://host entries (e.g. "s3://my-bucket,https://data.example.org").
+# Empty by default, which disables remote reads.
+_REMOTE_ALLOWLIST = tuple(entry.strip() for entry in
+                          os.environ.get("MCP_HDF5_REMOTE_ALLOWLIST", "").split(",")
+                          if entry.strip())
+
+# Simulated HDF5 files available under the base path
+_SIMULATED_FILES = (
+        "sample1.h5",
+        "sample2.h5",
+        "data/weather.h5",
+        "data/measurements.h5"
+        )
+
+# Simulated files whose path contains this marker do not exist
+_MISSING_FILE_MARKER = "nonexistent"
+
+# Valid datasets for simulation
+_VALID_DATASETS = frozenset({
+        "metadata",
+        "group1/temperature",
+        "group1/pressure",
+        "group2/timestamps",
+        "group2/subgroup1/data1",
+        "group2/subgroup1/data2",
+        "measurements/sensor1",
+        "measurements/sensor2",
+        "measurements/sensor3"
+        })
+
+# Simulated group structure returned by list_contents, keyed by group path
+# without a leading slash ("/" is the root group)
+_SIM_STRUCTURE = {
+        "/": {
+            "groups": ("group1", "group2", "measurements"),
+            "datasets": ("metadata",)
+            },
+        "group1": {
+            "groups": (),
+            "datasets": ("temperature", "pressure")
+            },
+        "group2": {
+            "groups": ("subgroup1",),
+            "datasets": ("timestamps",)
+            },
+        "group2/subgroup1": {
+            "groups": (),
+            "datasets": ("data1", "data2")
+            },
+        "measurements": {
+            "groups": (),
+            "datasets": ("sensor1", "sensor2", "sensor3")
+            }
+        }
+
 
 class HDF5Handler:
     """
     Handles operations on HDF5 files as part of MCP capability.
     """
 
-    def __init__(self, base_path: str = "/data/samples"):
+    def __init__(self, base_path: str = "/data/samples",
+                 max_open_files: int = _MAX_OPEN_FILES,
+                 remote_allowlist: Iterable[str] = _REMOTE_ALLOWLIST):
         """
         Initialize the HDF5 handler with a base path for sample data.
+
+        Args:
+            base_path: Directory that local HDF5 files are read from
+            max_open_files: Most HDF5 files kept open at once
+            remote_allowlist: scheme://host locations remote files may be
+                read from
         """
         self.base_path = base_path
+        self._real_base_path = os.path.realpath(base_path)
+        self._remote_allowlist = frozenset(_remote_location(entry)
+                                           for entry in remote_allowlist)
+
+        # Simulated resource list never changes, so it is built once here
+        self._resources_cache = tuple(self._build_resource(file_path)
+                                      for file_path in _SIMULATED_FILES)
+
+        # Recently read files stay open so later calls skip reopening them,
+        # along with their dataset handles and metadata (avoiding a B-tree
+        # walk on every access to the same dataset). Least recently used first.
+        self._file_cache: "OrderedDict[str, _OpenFile]" = OrderedDict()
+        self._max_open_files = max_open_files
+        self._file_lock = threading.Lock()
+
+    def close(self) -> None:
+        """
+        Close any HDF5 files held open by the handler and drop cached datasets.
+        """
+        with self._file_lock:
+            for open_file in self._file_cache.values():
+                open_file.file.close()
+            self._file_cache.clear()
 
     async def list_available_resources(self) -> List[Dict[str, Any]]:
         """
@@ -27,29 +137,7 @@ class HDF5Handler:
         Returns:
             List of resource objects for MCP
         """
-        # Simulate finding HDF5 files
-        simulated_files = [
-                "sample1.h5",
-                "sample2.h5",
-                "data/weather.h5",
-                "data/measurements.h5"
-                ]
-
-        resources = []
-        for file_path in simulated_files:
-            full_path = os.path.join(self.base_path, file_path)
-            resources.append({
-                "id": f"hdf5:{full_path}",
-                "name": os.path.basename(file_path),
-                "type": "hdf5",
-                "description": f"HDF5 data file: {file_path}",
-                "metadata": {
-                    "path": full_path,
-                    "simulated": True
-                    }
-                })
-
-        return resources
+        return list(self._resources_cache)
 
     async def get_resource_details(self, file_path: str) -> Dict[str, Any]:
         """
@@ -90,8 +178,17 @@ class HDF5Handler:
             dataset_path: Path to the dataset within the file
 
         Returns:
-            Dictionary with simulated dataset information and data
+            Dictionary with dataset information and data (simulated unless
+            the file exists under the base path or is an allowed remote URL)
         """
+        if self._is_remote(file_path):
+            self._check_remote_allowed(file_path)
+            return await asyncio.to_thread(self._read_file_dataset, file_path, dataset_path)
+
+        local_path = self._resolve_local_path(file_path)
+        if os.path.isfile(local_path):
+            return await asyncio.to_thread(self._read_file_dataset, local_path, dataset_path)
+
         if not self._simulate_file_exists(file_path):
             raise FileNotFoundError(f"HDF5 file not found: {file_path}")
 
@@ -133,7 +230,7 @@ class HDF5Handler:
                 }
 
     async def list_contents(self, file_path: str, group_path: Optional[str] =
-                            "/") -> Dict[str, List[str]]:
+                            "/") -> Dict[str, Any]:
         """
         List the contents (groups and datasets) within an HDF5 file.
 
@@ -142,83 +239,199 @@ class HDF5Handler:
             group_path: Path to the group within the file (default: root)
 
         Returns:
-            Dictionary with lists of groups and datasets
+            Dictionary with sequences of groups and datasets
         """
         if not self._simulate_file_exists(file_path):
             raise FileNotFoundError(f"HDF5 file not found: {file_path}")
 
-        if group_path != "/" and not self._simulate_group_exists(file_path, group_path):
+        # Normalize once so the root and every group resolve with one lookup
+        contents = _SIM_STRUCTURE.get((group_path or "/").lstrip("/") or "/")
+        if contents is None:
             raise ValueError(f"Group {group_path} not found in file")
 
-        simulated_structure = {
-                "/": {
-                    "groups": ["group1", "group2", "measurements"],
-                    "datasets": ["metadata"]
-                    },
-                "group1": {
-                    "groups": [],
-                    "datasets": ["temperature", "pressure"]
-                    },
-                "group2": {
-                    "groups": ["subgroup1"],
-                    "datasets": ["timestamps"]
-                    },
-                "group2/subgroup1": {
-                    "groups": [],
-                    "datasets": ["data1", "data2"]
-                    },
-                "measurements": {
-                    "groups": [],
-                    "datasets": ["sensor1", "sensor2", "sensor3"]
+        return {
+                "groups": contents["groups"],
+                "datasets": contents["datasets"],
+                "simulated": True
+                }
+
+    def _build_resource(self, file_path: str) -> Dict[str, Any]:
+        """
+        Build the MCP resource object for a simulated HDF5 file.
+
+        Args:
+            file_path: Path of the file relative to the base path
+
+        Returns:
+            Resource object for MCP
+        """
+        # Simulated paths are plain POSIX strings, so skip os.path.join/basename
+        full_path = f"{self.base_path.rstrip('/')}/{file_path}"
+        return {
+                "id": f"hdf5:{full_path}",
+                "name": file_path.rsplit("/", 1)[-1],
+                "type": "hdf5",
+                "description": f"HDF5 data file: {file_path}",
+                "metadata": {
+                    "path": full_path,
+                    "simulated": True
                     }
                 }
 
-        # Get the contents for the requested group
-        if group_path == "/":
-            contents = simulated_structure["/"]
-        else:
-            # Remove leading slash if present for lookup
-            lookup_path = group_path[1:] if group_path.startswith("/") else group_path
-            contents = simulated_structure.get(lookup_path, {"groups": [], "datasets": []})
+    def _read_file_dataset(self, file_path: str, dataset_path: str) -> Dict[str, Any]:
+        """
+        Read a dataset from an HDF5 file on disk or at a remote URL.
+
+        Args:
+            file_path: Path or URL of the HDF5 file
+            dataset_path: Path to the dataset within the file
+
+        Returns:
+            Dictionary with dataset information and data
+        """
+        # h5py serializes calls on its own global lock anyway, so holding ours
+        # through the read costs nothing and keeps the file from being
+        # evicted and closed mid-read
+        with self._file_lock:
+            open_file = self._get_file(file_path)
+            info = open_file.datasets.get(dataset_path)
+            if info is None:
+                info = open_file.datasets[dataset_path] = _load_dataset_info(open_file.file,
+                                                                             dataset_path)
+            dataset, shape, dtype, attributes = info
+            data = dataset[()]
 
         return {
-                "groups": contents["groups"],
-                "datasets": contents["datasets"],
-                "simulated": True
+                "data": _to_builtin(data),
+                "shape": shape,
+                "dtype": dtype,
+                "attributes": dict(attributes)
                 }
 
-    def _simulate_file_exists(self, file_path: str) -> bool:
+    def _get_file(self, file_path: str) -> "_OpenFile":
         """
-        Simulate checking if an HDF5 file exists.
+        Return an open HDF5 file, opening it on first use. Must be called with
+        the file lock held.
+
+        Local files are reopened when they changed on disk since they were
+        opened, and the least recently used file is closed once more than
+        the configured number are open.
 
         Args:
-            file_path: Path to the HDF5 file
+            file_path: Path or URL of the HDF5 file
 
         Returns:
-            True if the file exists, False otherwise
+            The open file with its cached dataset information
         """
-        if "nonexistent" in file_path:
-            return False
-        return True
+        signature = None if self._is_remote(file_path) else _file_signature(file_path)
+
+        open_file = self._file_cache.get(file_path)
+        if open_file is not None:
+            if open_file.signature == signature:
+                self._file_cache.move_to_end(file_path)
+                return open_file
+            # Rewritten since it was opened, so the cached handles are stale
+            del self._file_cache[file_path]
+            open_file.file.close()
+
+        open_file = _OpenFile(signature, self._open_file(file_path), {})
+        self._file_cache[file_path] = open_file
+        while len(self._file_cache) > self._max_open_files:
+            _, evicted = self._file_cache.popitem(last=False)
+            evicted.file.close()
+        return open_file
+
+    def _open_file(self, file_path: str) -> h5py.File:
+        """
+        Open an HDF5 file for reading with buffered access.
+
+        Local files get a large chunk cache and page buffer. Remote files are
+        read through fsspec in large blocks, so the many small reads HDF5 issues
+        are coalesced into few round trips.
 
-    def _simulate_group_exists(self, file_path: str, group_path: str) -> bool:
+        Args:
+            file_path: Path or URL of the HDF5 file
+
+        Returns:
+            Open h5py File object
         """
-        Simulate checking if a group exists in an HDF5 file.
+        cache_options = {
+                "rdcc_nbytes": _CHUNK_CACHE_BYTES,
+                "rdcc_nslots": _CHUNK_CACHE_SLOTS,
+                "page_buf_size": _PAGE_BUFFER_BYTES
+                }
+
+        if self._is_remote(file_path):
+            if fsspec is None:
+                raise ValueError(f"fsspec is required to read remote HDF5 files: {file_path}")
+            remote_file = fsspec.open(file_path, mode="rb", block_size=_REMOTE_BLOCK_SIZE,
+                                      cache_type="mmap").open()
+            hdf5_file = h5py.File(remote_file, "r", **cache_options)
+            # h5py does not close file-like objects it was given
+            weakref.finalize(hdf5_file, remote_file.close)
+            return hdf5_file
+
+        return h5py.File(file_path, "r", **cache_options)
+
+    def _is_remote(self, file_path: str) -> bool:
+        """
+        Check whether a file path is a remote URL (e.g. s3:// or https://).
+
+        Args:
+            file_path: Path or URL of the HDF5 file
+
+        Returns:
+            True if the path has a URL scheme, False otherwise
+        """
+        return "://" in file_path
+
+    def _resolve_local_path(self, file_path: str) -> str:
+        """
+        Resolve a local file path, confining it to the base path.
+
+        Relative paths are taken relative to the base path, and symlinks and
+        ".." components are resolved before the check.
 
         Args:
             file_path: Path to the HDF5 file
-            group_path: Path to the group within the file
 
         Returns:
-            True if the group exists, False otherwise
+            The resolved path
+
+        Raises:
+            PermissionError: If the path resolves outside the base path
         """
-        # Define valid groups for simulation
-        valid_groups = ["group1", "group2", "measurements", "group2/subgroup1"]
+        real_path = os.path.realpath(os.path.join(self.base_path, file_path))
+        if os.path.commonpath((self._real_base_path, real_path)) != self._real_base_path:
+            raise PermissionError(f"HDF5 file is outside {self.base_path}: {file_path}")
+        return real_path
 
-        # Remove leading slash if present for comparison
-        group_path = group_path[1:] if group_path.startswith("/") else group_path
+    def _check_remote_allowed(self, file_path: str) -> None:
+        """
+        Check a remote URL against the allowlist of schemes and hosts.
+
+        Args:
+            file_path: URL of the HDF5 file
+
+        Raises:
+            PermissionError: If the URL's scheme and host are not allowed
+        """
+        if _remote_location(file_path) not in self._remote_allowlist:
+            raise PermissionError(f"Remote HDF5 location is not allowed: {file_path}")
+
+    def _simulate_file_exists(self, file_path: str) -> bool:
+        """
+        Simulate checking if an HDF5 file exists.
 
-        return group_path in valid_groups
+        Args:
+            file_path: Path to the HDF5 file
+
+        Returns:
+            True if the file exists, False otherwise
+        """
+        # Paths shorter than the marker cannot contain it, so skip the search
+        return not (len(file_path) >= len(_MISSING_FILE_MARKER)
+                    and _MISSING_FILE_MARKER in file_path)
 
     def _simulate_dataset_exists(self, file_path: str, dataset_path: str) -> bool:
         """
@@ -231,20 +444,81 @@ class HDF5Handler:
         Returns:
             True if the dataset exists, False otherwise
         """
-        # Define valid datasets for simulation
-        valid_datasets = [
-                "metadata",
-                "group1/temperature",
-                "group1/pressure",
-                "group2/timestamps",
-                "group2/subgroup1/data1",
-                "group2/subgroup1/data2",
-                "measurements/sensor1",
-                "measurements/sensor2",
-                "measurements/sensor3"
-                ]
-
         # Remove leading slash if present for comparison
-        dataset_path = dataset_path[1:] if dataset_path.startswith("/") else dataset_path
+        return dataset_path.lstrip("/") in _VALID_DATASETS
+
+
+class _OpenFile(NamedTuple):
+    """An HDF5 file held open by the handler."""
+    # (inode, mtime, size) of a local file when it was opened; None for remote
+    signature: Optional[Tuple[int, int, int]]
+    file: h5py.File
+    # Dataset path -> (dataset handle, shape, dtype name, attributes)
+    datasets: Dict[str, Tuple[h5py.Dataset, Tuple[int, ...], str, Dict[str, Any]]]
+
+
+def _remote_location(url: str) -> Tuple[str, str]:
+    """
+    Extract the part of a URL that the remote allowlist matches on.
+
+    Args:
+        url: URL or scheme://host allowlist entry
+
+    Returns:
+        Tuple of (scheme, host[:port]), both lowercased
+    """
+    parts = urlsplit(url)
+    return parts.scheme.lower(), parts.netloc.lower()
+
+
+def _file_signature(file_path: str) -> Tuple[int, int, int]:
+    """
+    Identify the current contents of a local file.
+
+    Args:
+        file_path: Path to the file
 
-        return dataset_path in valid_datasets
+    Returns:
+        Tuple of (inode, modification time in ns, size)
+    """
+    file_stat = os.stat(file_path)
+    return file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size
+
+
+def _load_dataset_info(hdf5_file: h5py.File,
+                       dataset_path: str) -> Tuple[h5py.Dataset, Tuple[int, ...], str, Dict[str, Any]]:
+    """
+    Look up a dataset and its metadata.
+
+    Args:
+        hdf5_file: Open HDF5 file
+        dataset_path: Path to the dataset within the file
+
+    Returns:
+        Tuple of (dataset handle, shape, dtype name, attributes)
+    """
+    dataset = hdf5_file.get(dataset_path)
+    if not isinstance(dataset, h5py.Dataset):
+        raise ValueError(f"Dataset {dataset_path} not found in file")
+
+    attributes = {key: _to_builtin(value) for key, value in dataset.attrs.items()}
+    return dataset, dataset.shape, str(dataset.dtype), attributes
+
+
+def _to_builtin(value: Any) -> Any:
+    """
+    Convert numpy values read from HDF5 into JSON-friendly Python objects.
+
+    Args:
+        value: Value read from a dataset or attribute
+
+    Returns:
+        Equivalent built-in Python value
+    """
+    if isinstance(value, (np.ndarray, np.generic)):
+        value = value.tolist()
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    if isinstance(value, list):
+        return [_to_builtin(item) for item in value]
+    return value
@@ -1,16 +1,62 @@
 import os
+import time
 import platform
 import logging
-from typing import Dict, Any
+import functools
+from typing import Dict, Any, Optional, Sequence, Tuple
+import psutil
 
 logger = logging.getLogger(__name__)
 
+# CPU count does not change for the lifetime of the process
+_CPU_COUNT = os.cpu_count()
+
+# Memory and disk readings are reused for this long to coalesce bursts of polls
+_STATS_TTL_SECONDS = 0.5
+
+_BYTES_PER_GB = 1024 ** 3
+
+
+@functools.lru_cache(maxsize=1)
+def _static_platform() -> Dict[str, str]:
+    """
+    Collect platform information once per process.
+
+    platform.processor() and platform.architecture() can shell out to
+    uname/file, and none of these values change at runtime.
+
+    Returns:
+        Dictionary with static platform information
+    """
+    return {
+            "system": platform.system(),
+            "processor": platform.processor(),
+            "architecture": platform.architecture()[0],
+            "machine": platform.machine(),
+            "node": platform.node(),
+            "release": platform.release(),
+            "version": platform.version()
+            }
+
 
 class NodeHardwareHandler:
     """
     Handles operations related to node hardware information as part of MCP capability.
     """
 
+    def __init__(self, mount_points: Sequence[str] = ("/", "/data")):
+        """
+        Initialize the node hardware handler.
+
+        Args:
+            mount_points: Paths to report disk usage for (missing paths are skipped)
+        """
+        self.mount_points = tuple(mount_points)
+
+        # (monotonic timestamp, result) of the last memory and disk readings
+        self._mem_cache: Tuple[float, Optional[Dict[str, Any]]] = (0.0, None)
+        self._disk_cache: Tuple[float, Optional[Dict[str, Any]]] = (0.0, None)
+
     async def get_cpu_info(self) -> Dict[str, Any]:
         """
         Get information about the CPU on the current node.
@@ -19,22 +65,15 @@ class NodeHardwareHandler:
             Dictionary with CPU information
         """
         try:
-            # Get CPU count
-            cpu_count = os.cpu_count()
-
-            # Get platform information
-            system = platform.system()
-            processor = platform.processor()
-            architecture = platform.architecture()[0]
-            machine = platform.machine()
+            static_info = _static_platform()
 
             # Create a structured response
             return {
-                    "cpu_count": cpu_count,
-                    "system": system,
-                    "processor": processor,
-                    "architecture": architecture,
-                    "machine": machine
+                    "cpu_count": _CPU_COUNT,
+                    "system": static_info["system"],
+                    "processor": static_info["processor"],
+                    "architecture": static_info["architecture"],
+                    "machine": static_info["machine"]
                     }
         except Exception as e:
             logger.error(f"Error getting CPU info: {str(e)}")
@@ -48,14 +87,20 @@ class NodeHardwareHandler:
             Dictionary with memory information
         """
         try:
-            # Simulate memory information
-            return {
-                    "total_memory_gb": 32,
-                    "available_memory_gb": 24.5,
-                    "used_memory_gb": 7.5,
-                    "percent_used": 23.4,
-                    "simulated": True
+            now = time.monotonic()
+            cached_at, cached = self._mem_cache
+            if cached is not None and now - cached_at < _STATS_TTL_SECONDS:
+                return cached
+
+            memory = psutil.virtual_memory()
+            memory_info = {
+                    "total_memory_gb": round(memory.total / _BYTES_PER_GB, 2),
+                    "available_memory_gb": round(memory.available / _BYTES_PER_GB, 2),
+                    "used_memory_gb": round(memory.used / _BYTES_PER_GB, 2),
+                    "percent_used": memory.percent
                     }
+            self._mem_cache = (now, memory_info)
+            return memory_info
         except Exception as e:
             logger.error(f"Error getting memory info: {str(e)}")
             raise
@@ -64,32 +109,32 @@ class NodeHardwareHandler:
         """
         Get information about disk space on the current node.
 
-        This is a simulation that returns realistic but mock values.
-
         Returns:
             Dictionary with disk information
         """
         try:
-            # Simulate disk information
-            return {
-                    "mount_points": [
-                        {
-                            "path": "/",
-                            "total_gb": 500,
-                            "used_gb": 325,
-                            "available_gb": 175,
-                            "percent_used": 65.0
-                            },
-                        {
-                            "path": "/data",
-                            "total_gb": 2000,
-                            "used_gb": 1200,
-                            "available_gb": 800,
-                            "percent_used": 60.0
-                            }
-                        ],
-                    "simulated": True
-                    }
+            now = time.monotonic()
+            cached_at, cached = self._disk_cache
+            if cached is not None and now - cached_at < _STATS_TTL_SECONDS:
+                return cached
+
+            mount_points = []
+            for path in self.mount_points:
+                try:
+                    usage = psutil.disk_usage(path)
+                except OSError:
+                    continue
+                mount_points.append({
+                    "path": path,
+                    "total_gb": round(usage.total / _BYTES_PER_GB, 2),
+                    "used_gb": round(usage.used / _BYTES_PER_GB, 2),
+                    "available_gb": round(usage.free / _BYTES_PER_GB, 2),
+                    "percent_used": usage.percent
+                    })
+
+            disk_info = {"mount_points": mount_points}
+            self._disk_cache = (now, disk_info)
+            return disk_info
         except Exception as e:
             logger.error(f"Error getting disk info: {str(e)}")
             raise
@@ -108,16 +153,13 @@ class NodeHardwareHandler:
             disk_info = await self.get_disk_info()
 
             # Get additional system information
-            node_name = platform.node()
-            system = platform.system()
-            release = platform.release()
-            version = platform.version()
+            static_info = _static_platform()
 
             return {
-                    "node_name": node_name,
-                    "system": system,
-                    "release": release,
-                    "version": version,
+                    "node_name": static_info["node"],
+                    "system": static_info["system"],
+                    "release": static_info["release"],
+                    "version": static_info["version"],
                     "cpu": cpu_info,
                     "memory": memory_info,
                     "disk": disk_info
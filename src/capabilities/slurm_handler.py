@@ -1,10 +1,30 @@
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+import asyncio
 import logging
 import random
 import time
 
 logger = logging.getLogger(__name__)
 
+# Window in which job status lookups are collected into one batch query
+_STATUS_BATCH_WINDOW_SECONDS = 0.05
+
+
+@dataclass(slots=True)
+class JobRecord:
+    """A simulated Slurm job. Times are time.monotonic() values."""
+    job_id: str
+    script_path: str
+    job_name: str
+    partition: str
+    status: str
+    submit_time: float
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    node_list: Optional[str] = None
+
+
 class SlurmHandler:
     """
     Handles interactions with Slurm workload manager as part of MCP capability.
@@ -13,7 +33,10 @@ class SlurmHandler:
     def __init__(self):
         """Initialize the Slurm handler with a job database for simulation."""
         # Simulated job database for tracking jobs
-        self.jobs = {}
+        self.jobs: Dict[str, JobRecord] = {}
+
+        # Handler-local generator, avoiding the shared module-level instance
+        self._rng = random.Random()
 
     async def submit_job(self, script_path: str, job_name: Optional[str] = None, 
                          partition: Optional[str] = None) -> Dict[str, Any]:
@@ -33,28 +56,24 @@ class SlurmHandler:
             raise ValueError("Script path cannot be empty")
 
         # Generate a random job ID for simulation
-        job_id = str(random.randint(10000, 99999))
+        job_id = f"{self._rng.randrange(10000, 100000)}"
 
         # Create a simulated job record
-        job_record = {
-                "job_id": job_id,
-                "script_path": script_path,
-                "job_name": job_name or f"job_{job_id}",
-                "partition": partition or "compute",
-                "status": "PENDING",
-                "submit_time": time.time(),
-                "start_time": None,
-                "end_time": None,
-                "node_list": None,
-                "simulated": True
-                }
+        job_record = JobRecord(
+                job_id=job_id,
+                script_path=script_path,
+                job_name=job_name or f"job_{job_id}",
+                partition=partition or "compute",
+                status="PENDING",
+                submit_time=time.monotonic()
+                )
 
         # Store in simulated job database
         self.jobs[job_id] = job_record
-        if random.random() < 0.3:  # 30% chance the job is already running
-            self.jobs[job_id]["status"] = "RUNNING"
-            self.jobs[job_id]["start_time"] = time.time()
-            self.jobs[job_id]["node_list"] = f"node-{random.randint(1, 100)}"
+        if self._rng.random() < 0.3:  # 30% chance the job is already running
+            job_record.status = "RUNNING"
+            job_record.start_time = time.monotonic()
+            job_record.node_list = f"node-{self._rng.randrange(1, 101)}"
 
         return {
                 "job_id": job_id,
@@ -76,8 +95,49 @@ class SlurmHandler:
         if not job_id:
             raise ValueError("Job ID cannot be empty")
 
+        return self._job_status(job_id)
+
+    async def get_job_status_batch(self, job_ids: List[str]) -> Dict[str, Any]:
+        """
+        Simulate getting the status of several Slurm jobs in one query.
+
+        On a real cluster this maps to a single `sacct -j id1,id2,...`
+        invocation instead of one process per job.
+
+        Args:
+            job_ids: The Slurm job IDs
+
+        Returns:
+            Dictionary with a list of job status information, in request order
+        """
+        # A bare string is iterable too, so insist on an actual sequence
+        if not isinstance(job_ids, (list, tuple)):
+            raise ValueError("Job IDs must be a list of strings")
+
+        if not job_ids:
+            raise ValueError("Job IDs cannot be empty")
+
+        if not all(isinstance(job_id, str) and job_id for job_id in job_ids):
+            raise ValueError("Job IDs must be non-empty strings")
+
+        return {
+                "jobs": [self._job_status(job_id) for job_id in job_ids],
+                "simulated": True
+                }
+
+    def _job_status(self, job_id: str) -> Dict[str, Any]:
+        """
+        Advance and report the simulated state of a single job.
+
+        Args:
+            job_id: The Slurm job ID
+
+        Returns:
+            Dictionary with job status information
+        """
         # Check if job exists in our simulated database
-        if job_id not in self.jobs:
+        job = self.jobs.get(job_id)
+        if job is None:
             # Simulate getting info for unknown jobs
             return {
                     "job_id": job_id,
@@ -86,32 +146,133 @@ class SlurmHandler:
                     "simulated": True
                     }
 
-        job = self.jobs[job_id]
-
-        if job["status"] == "PENDING" and random.random() < 0.5:
+        if job.status == "PENDING" and self._rng.random() < 0.5:
             # 50% chance a pending job is now running
-            job["status"] = "RUNNING"
-            job["start_time"] = time.time()
-            job["node_list"] = f"node-{random.randint(1, 100)}"
-        elif job["status"] == "RUNNING" and random.random() < 0.2:
+            job.status = "RUNNING"
+            job.start_time = time.monotonic()
+            job.node_list = f"node-{self._rng.randrange(1, 101)}"
+        elif job.status == "RUNNING" and self._rng.random() < 0.2:
             # 20% chance a running job is now completed
-            job["status"] = "COMPLETED"
-            job["end_time"] = time.time()
+            job.status = "COMPLETED"
+            job.end_time = time.monotonic()
 
         # Calculate elapsed time
         elapsed = None
-        if job["start_time"]:
-            end_time = job["end_time"] or time.time()
-            elapsed_seconds = end_time - job["start_time"]
+        if job.start_time is not None:
+            end_time = job.end_time or time.monotonic()
+            elapsed_seconds = int(end_time - job.start_time)
             # Format as HH:MM:SS
-            elapsed = time.strftime("%H:%M:%S", time.gmtime(elapsed_seconds))
+            hours, remainder = divmod(elapsed_seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            elapsed = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
         return {
                 "job_id": job_id,
-                "state": job["status"],
-                "job_name": job["job_name"],
-                "partition": job["partition"],
+                "state": job.status,
+                "job_name": job.job_name,
+                "partition": job.partition,
                 "elapsed": elapsed,
-                "node_list": job["node_list"],
+                "node_list": job.node_list,
                 "simulated": True
                 }
+
+
+class SlurmStatusBatcher:
+    """
+    Coalesces concurrent job status lookups into one batch query.
+
+    Lookups arriving within a short window are answered by a single
+    get_job_status_batch call (one sacct invocation on a real cluster), so N
+    polling clients cost one backend query per window instead of N.
+
+    Each running event loop gets its own batch and flush task, so futures are
+    only ever resolved on the loop (and thread) that created them.
+    """
+
+    def __init__(self, handler: SlurmHandler,
+                 window: float = _STATUS_BATCH_WINDOW_SECONDS):
+        """
+        Initialize the batcher.
+
+        Args:
+            handler: Slurm handler that runs the batch queries
+            window: Seconds to collect lookups before querying
+        """
+        self._handler = handler
+        self._window = window
+        # Event loop -> job ID -> futures waiting on that job's status
+        self._pending: Dict[asyncio.AbstractEventLoop, Dict[str, List[asyncio.Future]]] = {}
+        # Event loop -> task that flushes that loop's batch
+        self._flush_tasks: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+
+    def enqueue(self, job_id: str) -> "asyncio.Future[Dict[str, Any]]":
+        """
+        Queue a job status lookup for the running loop's next batch query.
+
+        Args:
+            job_id: The Slurm job ID
+
+        Returns:
+            Future resolving to the job status information
+        """
+        if not job_id:
+            raise ValueError("Job ID cannot be empty")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.get(loop)
+        if pending is None:
+            # Only this loop's thread touches its entries, so no lock is needed
+            pending = self._pending[loop] = {}
+            self._flush_tasks[loop] = loop.create_task(self._flush_after_window(loop))
+        pending.setdefault(job_id, []).append(future)
+        return future
+
+    async def get_job_status(self, job_id: str) -> Dict[str, Any]:
+        """
+        Get the status of a Slurm job through the next batch query.
+
+        Args:
+            job_id: The Slurm job ID
+
+        Returns:
+            Dictionary with job status information
+        """
+        return await self.enqueue(job_id)
+
+    async def _flush_after_window(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Wait out the window, then resolve every lookup pending on this loop
+        from one query.
+
+        Args:
+            loop: The running loop whose batch is flushed
+        """
+        try:
+            await asyncio.sleep(self._window)
+        except asyncio.CancelledError:
+            # The loop is shutting down; release the waiters with it
+            for futures in self._pending.pop(loop).values():
+                for future in futures:
+                    future.cancel()
+            del self._flush_tasks[loop]
+            raise
+
+        pending = self._pending.pop(loop)
+        del self._flush_tasks[loop]
+
+        try:
+            statuses = (await self._handler.get_job_status_batch(list(pending)))["jobs"]
+        except Exception as e:
+            logger.error(f"Error querying job status batch: {str(e)}")
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for futures, status in zip(pending.values(), statuses):
+            for future in futures:
+                # Callers that gave up have cancelled their future
+                if not future.done():
+                    future.set_result(status)
@@ -1,15 +1,42 @@
-from typing import Dict, Any, List
+from typing import Awaitable, Callable, Dict, Any, List, Tuple
+import asyncio
 import logging
+import os
+import time
+import orjson
+from .async_loop import LoopLocal, get_loop_thread
 from .capabilities.hdf5_handler import HDF5Handler
-from .capabilities.slurm_handler import SlurmHandler
+from .capabilities.slurm_handler import SlurmHandler, SlurmStatusBatcher
 from .capabilities.node_hardware import NodeHardwareHandler
 from .capabilities.compression import CompressionHandler
 
 logger = logging.getLogger(__name__)
 
+# Per-capability concurrency limits, matched to what each backend can run in
+# parallel: HDF5 reads serialize on the library's global lock, Slurm queries
+# hit the controller, and compression is bound by CPU cores
+_CONCURRENCY_LIMITS: Dict[str, int] = {
+        "hdf5": int(os.environ.get("MCP_HDF5_CONCURRENCY", 4)),
+        "slurm": int(os.environ.get("MCP_SLURM_CONCURRENCY", 2)),
+        "compression": int(os.environ.get("MCP_COMPRESSION_CONCURRENCY") or os.cpu_count() or 1)
+        }
+
+# The limits apply per event loop: the server's loop and the sync bridge's
+# loop each get their own semaphores
+_capability_semaphores: LoopLocal[Dict[str, asyncio.Semaphore]] = LoopLocal(
+        lambda: {capability: asyncio.Semaphore(limit)
+                 for capability, limit in _CONCURRENCY_LIMITS.items()}
+        )
+
+# mcp/listResources results are reused for this many seconds
+_RESOURCES_TTL_SECONDS = float(os.environ.get("MCP_RES_TTL_SEC", 30))
+_resources_cache: Tuple[float, List[Dict[str, Any]]] = (float("-inf"), [])
+_resources_lock: LoopLocal[asyncio.Lock] = LoopLocal(asyncio.Lock)
+
 # Initialize capability handlers
 hdf5_handler = HDF5Handler()
 slurm_handler = SlurmHandler()
+slurm_status_batcher = SlurmStatusBatcher(slurm_handler)
 node_hardware_handler = NodeHardwareHandler()
 compression_handler = CompressionHandler()
 
@@ -20,19 +47,30 @@ async def handle_list_resources(params: Dict[str, Any]) -> Dict[str, Any]:
 
     Returns a list of available MCP resources.
     """
-    # Simulate listing available HDF5 files as resources
-    resources = await hdf5_handler.list_available_resources()
+    global _resources_cache
+
+    # Serve from the cache while it is fresh; otherwise let one caller refresh
+    # it while concurrent callers wait for that result
+    cached_at, resources = _resources_cache
+    if time.monotonic() - cached_at >= _RESOURCES_TTL_SECONDS:
+        async with _resources_lock.get():
+            cached_at, resources = _resources_cache
+            if time.monotonic() - cached_at >= _RESOURCES_TTL_SECONDS:
+                # Simulate listing available HDF5 files as resources
+                resources = await hdf5_handler.list_available_resources()
+                _resources_cache = (time.monotonic(), resources)
 
     return {
             "resources": resources
             }
 
 
-async def handle_list_tools(params: Dict[str, Any]) -> Dict[str, Any]:
+def _build_tools() -> List[Dict[str, Any]]:
     """
-    Handle mcp/listTools requests.
+    Build the static tool catalog.
 
-    Returns a list of available MCP tools.
+    A new copy is built on every call, so no caller can alter the catalog
+    that TOOLS_JSON (and the listTools ETag derived from it) describes.
     """
     tools = [
             # HDF5 tools
@@ -140,6 +178,23 @@ async def handle_list_tools(params: Dict[str, Any]) -> Dict[str, Any]:
                         }
                     }
                 },
+        {
+                "id": "slurm.get_job_status_batch",
+                "name": "Get Slurm Job Status (Batch)",
+                "description": "Check the status of several Slurm jobs in one query",
+                "parameters": {
+                    "job_ids": {
+                        "type": "array",
+                        "description": "The Slurm job IDs"
+                        }
+                    },
+                "returns": {
+                    "jobs": {
+                        "type": "array",
+                        "description": "Status information for each job, in request order"
+                        }
+                    }
+                },
         # Node Hardware tools
         {
                 "id": "node.get_cpu_info",
@@ -221,7 +276,17 @@ async def handle_list_tools(params: Dict[str, Any]) -> Dict[str, Any]:
                         },
                     "algorithm": {
                         "type": "string",
-                        "description": "Compression algorithm to use (gzip or zlib)",
+                        "description": "Compression algorithm to use (gzip, zlib or zstd)",
+                        "optional": True
+                        },
+                    "compresslevel": {
+                        "type": "integer",
+                        "description": "Compression level (default 1, favouring speed)",
+                        "optional": True
+                        },
+                    "include_full_data": {
+                        "type": "boolean",
+                        "description": "Return the full base64 encoded compressed data instead of a preview",
                         "optional": True
                         }
                     },
@@ -244,7 +309,11 @@ async def handle_list_tools(params: Dict[str, Any]) -> Dict[str, Any]:
                         },
                     "compressed_data_b64": {
                         "type": "string",
-                        "description": "Base64 encoded compressed data (truncated)"
+                        "description": "Base64 encoded compressed data (truncated, without include_full_data)"
+                        },
+                    "full_compressed_data_b64": {
+                        "type": "string",
+                        "description": "Base64 encoded compressed data (only with include_full_data)"
                         }
                     }
                 },
@@ -255,7 +324,7 @@ async def handle_list_tools(params: Dict[str, Any]) -> Dict[str, Any]:
                 "parameters": {
                     "file_path": {
                         "type": "string",
-                        "description": "Path to the file to compress"
+                        "description": "Path to the file to compress, under the data directory"
                         },
                     "output_path": {
                         "type": "string",
@@ -264,7 +333,12 @@ async def handle_list_tools(params: Dict[str, Any]) -> Dict[str, Any]:
                         },
                     "algorithm": {
                         "type": "string",
-                        "description": "Compression algorithm to use (gzip or zlib)",
+                        "description": "Compression algorithm to use (gzip, zlib or zstd)",
+                        "optional": True
+                        },
+                    "overwrite": {
+                        "type": "boolean",
+                        "description": "Replace the output file if it already exists",
                         "optional": True
                         }
                     },
@@ -298,7 +372,7 @@ async def handle_list_tools(params: Dict[str, Any]) -> Dict[str, Any]:
                         },
                     "algorithm": {
                         "type": "string",
-                        "description": "Compression algorithm used (gzip or zlib)",
+                        "description": "Compression algorithm used (gzip, zlib or zstd)",
                         "optional": True
                         }
                     },
@@ -323,8 +397,22 @@ async def handle_list_tools(params: Dict[str, Any]) -> Dict[str, Any]:
                 }
     ]
 
+    return tools
+
+
+# Pre-serialized tool catalog, so the server can answer listTools without
+# rebuilding or re-encoding it
+TOOLS_JSON = orjson.dumps({"tools": _build_tools()})
+
+
+async def handle_list_tools(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle mcp/listTools requests.
+
+    Returns a list of available MCP tools.
+    """
     return {
-            "tools": tools
+            "tools": _build_tools()
             }
 
 
@@ -349,92 +437,158 @@ async def handle_get_resource(params: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError(f"Unsupported resource type: {resource_id}")
 
 
-async def handle_call_tool(params: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Handle mcp/callTool requests.
-
-    Executes a tool with the provided parameters.
-    """
-    tool_id = params.get("id")
-    tool_params = params.get("parameters", {})
-
-    if not tool_id:
-        raise ValueError("Tool ID not provided")
+# Tool adapters: each extracts its parameters and calls the capability handler
 
-    # Route to appropriate handler based on tool ID
-    if tool_id == "hdf5.read_dataset":
-        result = await hdf5_handler.read_dataset(
+async def _call_hdf5_read_dataset(tool_params: Dict[str, Any]) -> Dict[str, Any]:
+    async with _capability_semaphores.get()["hdf5"]:
+        return await hdf5_handler.read_dataset(
                 tool_params.get("file_path", ""),
                 tool_params.get("dataset_path", "")
                 )
-        return {
-                "result": result
-                }
-    elif tool_id == "hdf5.list_contents":
-        result = await hdf5_handler.list_contents(
+
+
+async def _call_hdf5_list_contents(tool_params: Dict[str, Any]) -> Dict[str, Any]:
+    async with _capability_semaphores.get()["hdf5"]:
+        return await hdf5_handler.list_contents(
                 tool_params.get("file_path", ""),
                 tool_params.get("group_path", "/")
                 )
-        return {
-                "result": result
-                }
-    elif tool_id == "slurm.submit_job":
-        result = await slurm_handler.submit_job(
+
+
+async def _call_slurm_submit_job(tool_params: Dict[str, Any]) -> Dict[str, Any]:
+    async with _capability_semaphores.get()["slurm"]:
+        return await slurm_handler.submit_job(
                 tool_params.get("script_path", ""),
                 tool_params.get("job_name"),
                 tool_params.get("partition")
                 )
-        return {
-                "result": result
-                }
-    elif tool_id == "slurm.get_job_status":
-        result = await slurm_handler.get_job_status(
-                tool_params.get("job_id", "")
+
+
+async def _call_slurm_get_job_status(tool_params: Dict[str, Any]) -> Dict[str, Any]:
+    # The batcher issues one query per window, so waiting on it does not
+    # take a Slurm concurrency slot
+    return await slurm_status_batcher.get_job_status(
+            tool_params.get("job_id", "")
+            )
+
+
+async def _call_slurm_get_job_status_batch(tool_params: Dict[str, Any]) -> Dict[str, Any]:
+    async with _capability_semaphores.get()["slurm"]:
+        return await slurm_handler.get_job_status_batch(
+                tool_params.get("job_ids", [])
                 )
-        return {
-                "result": result
-                }
-    # Node Hardware Tools
-    elif tool_id == "node.get_cpu_info":
-        result = await node_hardware_handler.get_cpu_info()
-        return {
-                "result": result
-                }
-    elif tool_id == "node.get_memory_info":
-        result = await node_hardware_handler.get_memory_info()
-        return {
-                "result": result
-                }
-    elif tool_id == "node.get_system_info":
-        result = await node_hardware_handler.get_system_info()
-        return {
-                "result": result
-                }
-        # Compression Tools
-    elif tool_id == "compression.compress_data":
-        result = await compression_handler.compress_data(
+
+
+async def _call_node_get_cpu_info(tool_params: Dict[str, Any]) -> Dict[str, Any]:
+    return await node_hardware_handler.get_cpu_info()
+
+
+async def _call_node_get_memory_info(tool_params: Dict[str, Any]) -> Dict[str, Any]:
+    return await node_hardware_handler.get_memory_info()
+
+
+async def _call_node_get_system_info(tool_params: Dict[str, Any]) -> Dict[str, Any]:
+    return await node_hardware_handler.get_system_info()
+
+
+async def _call_compression_compress_data(tool_params: Dict[str, Any]) -> Dict[str, Any]:
+    async with _capability_semaphores.get()["compression"]:
+        return await compression_handler.compress_data(
                 tool_params.get("data", ""),
-                tool_params.get("algorithm", "gzip")
+                tool_params.get("algorithm", "gzip"),
+                tool_params.get("compresslevel", 1),
+                tool_params.get("include_full_data", False)
                 )
-        return {
-                "result": result
-                }
-    elif tool_id == "compression.compress_file":
-        result = await compression_handler.compress_file(
+
+
+async def _call_compression_compress_file(tool_params: Dict[str, Any]) -> Dict[str, Any]:
+    async with _capability_semaphores.get()["compression"]:
+        return await compression_handler.compress_file(
                 tool_params.get("file_path", ""),
                 tool_params.get("output_path"),
-                tool_params.get("algorithm", "gzip")
+                tool_params.get("algorithm", "gzip"),
+                tool_params.get("overwrite", False)
                 )
-        return {
-                "result": result
-                }
-    elif tool_id == "compression.decompress_data":
-        result = await compression_handler.decompress_data(
+
+
+async def _call_compression_decompress_data(tool_params: Dict[str, Any]) -> Dict[str, Any]:
+    async with _capability_semaphores.get()["compression"]:
+        return await compression_handler.decompress_data(
                 tool_params.get("compressed_data_b64", ""),
                 tool_params.get("algorithm", "gzip")
                 )
-        return {
-                "result": result
-                }
-    else:
+
+
+# Tool ID -> adapter
+_TOOL_DISPATCH: Dict[str, Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]] = {
+        "hdf5.read_dataset": _call_hdf5_read_dataset,
+        "hdf5.list_contents": _call_hdf5_list_contents,
+        "slurm.submit_job": _call_slurm_submit_job,
+        "slurm.get_job_status": _call_slurm_get_job_status,
+        "slurm.get_job_status_batch": _call_slurm_get_job_status_batch,
+        "node.get_cpu_info": _call_node_get_cpu_info,
+        "node.get_memory_info": _call_node_get_memory_info,
+        "node.get_system_info": _call_node_get_system_info,
+        "compression.compress_data": _call_compression_compress_data,
+        "compression.compress_file": _call_compression_compress_file,
+        "compression.decompress_data": _call_compression_decompress_data
+        }
+
+
+async def handle_call_tool(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle mcp/callTool requests.
+
+    Executes a tool with the provided parameters.
+    """
+    tool_id = params.get("id")
+    tool_params = params.get("parameters", {})
+
+    if not tool_id:
+        raise ValueError("Tool ID not provided")
+
+    # Route to appropriate handler based on tool ID
+    call_tool = _TOOL_DISPATCH.get(tool_id)
+    if call_tool is None:
         raise ValueError(f"Unsupported tool: {tool_id}")
+
+    return {
+            "result": await call_tool(tool_params)
+            }
+
+
+def handle_call_tool_sync(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Synchronous counterpart of handle_call_tool for in-process callers.
+
+    Runs the call on the shared background event loop rather than starting a
+    new loop per call, so calls from several threads can overlap.
+    """
+    return get_loop_thread().run(handle_call_tool(params))
+
+
+async def handle_call_tool_batch(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle mcp/callToolBatch requests.
+
+    Executes several independent tool calls concurrently. Results keep the
+    order of the calls; a failing call yields an error entry without
+    affecting the others.
+    """
+    calls = params.get("calls")
+    if not calls:
+        raise ValueError("Tool calls not provided")
+
+    if not isinstance(calls, list) or not all(isinstance(call, dict) for call in calls):
+        raise ValueError("Tool calls must be a list of objects")
+
+    outcomes = await asyncio.gather(*(handle_call_tool(call) for call in calls),
+                                    return_exceptions=True)
+
+    return {
+            "results": [
+                {"error": {"message": str(outcome)}} if isinstance(outcome, Exception)
+                else outcome
+                for outcome in outcomes
+                ]
+            }
@@ -1,26 +1,138 @@
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Union
+from logging.handlers import QueueHandler, QueueListener
 import uvicorn
+import asyncio
+import atexit
+import hashlib
 import logging
-import json
+import os
+import queue
+import msgspec
+import orjson
 from .mcp_handlers import (
         handle_list_resources,
         handle_list_tools,
         handle_get_resource,
-        handle_call_tool
+        handle_call_tool,
+        handle_call_tool_batch,
+        TOOLS_JSON
         )
 
-# Configure logging
-logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+# Configure logging. Records are handed to a background listener thread
+# through a queue, so formatting and the stream write stay off the event loop.
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
         )
+_log_listener = QueueListener(_log_queue, _log_stream_handler,
+                              respect_handler_level=True)
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(QueueHandler(_log_queue))
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Scientific MCP Server",
               description="MCP server for scientific computing resources")
 
 
+# JSON-RPC envelope for mcp/listTools around the pre-serialized tool catalog
+_LIST_TOOLS_PREFIX = b'{"jsonrpc":"2.0","result":' + TOOLS_JSON + b',"id":'
+
+# The tool catalog only changes between deploys, so clients can revalidate
+# their copy with If-None-Match instead of downloading it again
+_TOOLS_ETAG = '"' + hashlib.blake2b(TOOLS_JSON, digest_size=8).hexdigest() + '"'
+_LIST_TOOLS_HEADERS = {"ETag": _TOOLS_ETAG, "Cache-Control": "public, max-age=60"}
+
+# Longest validation message returned to the client
+_MAX_ERROR_MESSAGE_CHARS = 200
+
+# Constant error responses, serialized once
+_ERR_PARSE = orjson.dumps({"error": {"code": -32700, "message":
+                                     "Parse error: Invalid JSON"}})
+_ERR_EMPTY_BATCH = orjson.dumps({"error": {"code": -32600, "message":
+                                           "Invalid Request: Empty batch"}})
+
+
+def _json_response(content: Any, status_code: int = 200) -> Response:
+    """
+    Build a JSON response serialized with orjson.
+    """
+    return Response(content=orjson.dumps(content), status_code=status_code,
+                    media_type="application/json")
+
+
+# JSON-RPC method -> handler
+_METHOD_DISPATCH: Dict[str, Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]] = {
+        "mcp/listResources": handle_list_resources,
+        "mcp/listTools": handle_list_tools,
+        "mcp/getResource": handle_get_resource,
+        "mcp/callTool": handle_call_tool,
+        "mcp/callToolBatch": handle_call_tool_batch
+        }
+
+
+class JsonRpcReq(msgspec.Struct):
+    """A JSON-RPC 2.0 request object, validated while it is decoded."""
+    jsonrpc: Literal["2.0"]
+    method: str
+    id: Union[int, str]
+    params: Dict[str, Any] = {}
+
+
+# A request body is either a single request or a batch whose elements are
+# kept raw and validated one by one, so a bad element only fails itself
+_BODY_DECODER = msgspec.json.Decoder(Union[JsonRpcReq, List[msgspec.Raw]])
+_REQUEST_DECODER = msgspec.json.Decoder(JsonRpcReq)
+
+
+def _invalid_request(error: msgspec.ValidationError) -> Response:
+    """
+    Build the -32600 response for a request that failed validation.
+    """
+    # msgspec quotes the offending value, so cap how much client input is
+    # echoed back
+    message = str(error)
+    if len(message) > _MAX_ERROR_MESSAGE_CHARS:
+        message = f"{message[:_MAX_ERROR_MESSAGE_CHARS]}..."
+
+    return _json_response(
+            status_code=400,
+            content={"error": {"code": -32600, "message":
+                               f"Invalid Request: {message}"}}
+            )
+
+
+def _tools_etag_matches(if_none_match: Union[str, None]) -> bool:
+    """
+    Check an If-None-Match header against the tool catalog ETag.
+
+    Args:
+        if_none_match: Header value, or None if the header is absent
+
+    Returns:
+        True if the client's cached copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2), so a W/ prefix is
+    # ignored and only the opaque tags are compared
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == _TOOLS_ETAG:
+            return True
+    return False
+
+
 @app.post("/mcp")
 async def mcp_endpoint(request: Request):
     """
@@ -28,48 +140,62 @@ async def mcp_endpoint(request: Request):
     """
 
     try:
-        # Parse the JSON-RPC request
-        body = await request.json()
-
-        # Validate JSON-RPC structure
-        if "jsonrpc" not in body or body["jsonrpc"] != "2.0":
-            return JSONResponse(
-                    status_code=400,
-                    content={"error": {"code": -32600, "message":
-                                       "Invalid Request: Not a valid JSON-RPC 2.0 request"}}
-                    )
+        # Parse and validate the JSON-RPC request in one pass
+        body = _BODY_DECODER.decode(await request.body())
+    except msgspec.ValidationError as e:
+        return _invalid_request(e)
+    except msgspec.DecodeError:
+        return Response(content=_ERR_PARSE, status_code=400,
+                        media_type="application/json")
 
-        if "method" not in body:
-            return JSONResponse(
-                    status_code=400,
-                    content={"error": {"code": -32600, "message":
-                                       "Invalid Request: Method not specified"}}
-                    )
+    # JSON-RPC batch: run the independent requests concurrently and return
+    # their responses as one array
+    if isinstance(body, list):
+        if not body:
+            return Response(content=_ERR_EMPTY_BATCH, status_code=400,
+                            media_type="application/json")
+        responses = await asyncio.gather(*(_dispatch_raw(item) for item in body))
+        return Response(content=b"[" + b",".join(response.body for response in responses) + b"]",
+                        media_type="application/json")
 
-        if "id" not in body:
-            return JSONResponse(
-                    status_code=400,
-                    content={"error": {"code": -32600, "message":
-                                       "Invalid Request: ID not specified"}}
-                    )
+    if (body.method == "mcp/listTools"
+            and _tools_etag_matches(request.headers.get("if-none-match"))):
+        return Response(status_code=304, headers=_LIST_TOOLS_HEADERS)
+
+    return await _dispatch(body)
+
+
+async def _dispatch_raw(raw: msgspec.Raw) -> Response:
+    """
+    Validate and handle one element of a JSON-RPC batch.
+    """
+    try:
+        body = _REQUEST_DECODER.decode(raw)
+    except msgspec.ValidationError as e:
+        return _invalid_request(e)
+
+    return await _dispatch(body)
 
-        # Extract method, params, and id
-        method = body["method"]
-        params = body.get("params", {})
-        request_id = body["id"]
+
+async def _dispatch(body: JsonRpcReq) -> Response:
+    """
+    Handle a single validated JSON-RPC 2.0 request.
+    """
+
+    try:
+        method = body.method
+        params = body.params
+        request_id = body.id
+
+        # The tool catalog is static, so splice the id into pre-built bytes
+        if method == "mcp/listTools":
+            return Response(content=b"".join((_LIST_TOOLS_PREFIX, orjson.dumps(request_id), b"}")),
+                            headers=_LIST_TOOLS_HEADERS, media_type="application/json")
 
         # Route to appropriate handler based on method
-        result = None
-        if method == "mcp/listResources":
-            result = await handle_list_resources(params)
-        elif method == "mcp/listTools":
-            result = await handle_list_tools(params)
-        elif method == "mcp/getResource":
-            result = await handle_get_resource(params)
-        elif method == "mcp/callTool":
-            result = await handle_call_tool(params)
-        else:
-            return JSONResponse(
+        handler = _METHOD_DISPATCH.get(method)
+        if handler is None:
+            return _json_response(
                     content={
                         "jsonrpc": "2.0",
                         "error": {"code": -32601, "message": f"Method '{method}' not found"},
@@ -77,8 +203,10 @@ async def mcp_endpoint(request: Request):
                         }
                     )
 
+        result = await handler(params)
+
         # Return successful response
-        return JSONResponse(
+        return _json_response(
                 content={
                     "jsonrpc": "2.0",
                     "result": result,
@@ -86,15 +214,9 @@ async def mcp_endpoint(request: Request):
                     }
                 )
 
-    except json.JSONDecodeError:
-        return JSONResponse(
-                status_code=400,
-                content={"error": {"code": -32700, "message":
-                                   "Parse error: Invalid JSON"}}
-                )
     except Exception as e:
         logger.error(f"Error handling MCP request: {str(e)}")
-        return JSONResponse(
+        return _json_response(
                 status_code=500,
                 content={
                     "jsonrpc": "2.0",
@@ -111,4 +233,10 @@ async def health_check():
     return {"status": "healthy"}
 
 if __name__ == "__main__":
-    uvicorn.run("src.server:app", host="0.0.0.0", port=8000, reload=True)
+    # MCP_DEV=1 runs a single auto-reloading worker for development
+    dev_mode = os.environ.get("MCP_DEV") == "1"
+    uvicorn.run("src.server:app", host="0.0.0.0", port=8000,
+                reload=dev_mode,
+                workers=1 if dev_mode else int(os.environ.get("MCP_WORKERS") or 1),
+                loop="auto", http="auto",
+                log_level="info" if dev_mode else "warning")
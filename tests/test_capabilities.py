@@ -1,17 +1,33 @@
 import pytest
 import asyncio
 import random
+import base64
+import gzip
+import zlib
+import h5py
+import numpy as np
 from src.capabilities.hdf5_handler import HDF5Handler
-from src.capabilities.slurm_handler import SlurmHandler
+from src.capabilities.slurm_handler import SlurmHandler, SlurmStatusBatcher
 from src.capabilities.node_hardware import NodeHardwareHandler
 from src.capabilities.compression import CompressionHandler
 
 
+@pytest.fixture(scope="module")
+def node_handler():
+    """Node hardware handler shared by the tests in this module."""
+    return NodeHardwareHandler()
+
+
+@pytest.fixture(scope="module")
+def compression_handler():
+    """Compression handler shared by the tests in this module."""
+    return CompressionHandler()
+
+
 @pytest.mark.asyncio
-async def test_node_hardware_get_cpu_info():
+async def test_node_hardware_get_cpu_info(node_handler):
     """Test getting CPU information."""
-    handler = NodeHardwareHandler()
-    result = await handler.get_cpu_info()
+    result = await node_handler.get_cpu_info()
 
     assert "cpu_count" in result
     assert isinstance(result["cpu_count"], int)
@@ -21,10 +37,9 @@ async def test_node_hardware_get_cpu_info():
 
 
 @pytest.mark.asyncio
-async def test_node_hardware_get_memory_info():
+async def test_node_hardware_get_memory_info(node_handler):
     """Test getting memory information."""
-    handler = NodeHardwareHandler()
-    result = await handler.get_memory_info()
+    result = await node_handler.get_memory_info()
 
     assert "total_memory_gb" in result
     assert "available_memory_gb" in result
@@ -33,10 +48,9 @@ async def test_node_hardware_get_memory_info():
 
 
 @pytest.mark.asyncio
-async def test_node_hardware_get_system_info():
+async def test_node_hardware_get_system_info(node_handler):
     """Test getting system information."""
-    handler = NodeHardwareHandler()
-    result = await handler.get_system_info()
+    result = await node_handler.get_system_info()
 
     assert "node_name" in result
     assert "system" in result
@@ -46,13 +60,12 @@ async def test_node_hardware_get_system_info():
 
 
 @pytest.mark.asyncio
-async def test_compression_compress_data():
+async def test_compression_compress_data(compression_handler):
     """Test compressing string data."""
-    handler = CompressionHandler()
     test_data = "This is some test data to compress. " * 10
 
     # Test with gzip
-    result = await handler.compress_data(test_data, "gzip")
+    result = await compression_handler.compress_data(test_data, "gzip")
     assert "algorithm" in result
     assert result["algorithm"] == "gzip"
     assert "original_size_bytes" in result
@@ -60,57 +73,122 @@ async def test_compression_compress_data():
     assert "compression_ratio" in result
     assert "compressed_data_b64" in result
     assert result["original_size_bytes"] > result["compressed_size_bytes"]
+    assert "full_compressed_data_b64" not in result
+
+    # Test requesting the full data, which replaces the preview
+    result = await compression_handler.compress_data(test_data, "gzip", include_full_data=True)
+    assert "full_compressed_data_b64" in result
+    assert "compressed_data_b64" not in result
 
     # Test with zlib
-    result = await handler.compress_data(test_data, "zlib")
+    result = await compression_handler.compress_data(test_data, "zlib")
     assert result["algorithm"] == "zlib"
     assert result["original_size_bytes"] > result["compressed_size_bytes"]
 
     # Test with empty data
     with pytest.raises(ValueError):
-        await handler.compress_data("", "gzip")
+        await compression_handler.compress_data("", "gzip")
 
     # Test with invalid algorithm
     with pytest.raises(ValueError):
-        await handler.compress_data(test_data, "invalid_algo")
+        await compression_handler.compress_data(test_data, "invalid_algo")
+
+    # Test with non-integer compression levels
+    for compresslevel in ("6", 6.0, None, True):
+        with pytest.raises(ValueError):
+            await compression_handler.compress_data(test_data, "gzip", compresslevel)
 
 
 @pytest.mark.asyncio
-async def test_compression_compress_file():
+async def test_compression_compress_file(tmp_path):
     """Test compressing a file."""
-    handler = CompressionHandler()
+    compression_handler = CompressionHandler(base_path=str(tmp_path))
+    test_data = b"This is some test data to compress. " * 1000
+    file_path = tmp_path / "file.txt"
+    file_path.write_bytes(test_data)
 
     # Test with valid file path
-    result = await handler.compress_file("/path/to/file.txt")
+    result = await compression_handler.compress_file(str(file_path))
     assert "algorithm" in result
     assert "original_file" in result
     assert "compressed_file" in result
     assert "compression_ratio" in result
+    assert result["compressed_file"] == f"{file_path}.gz"
+    assert result["original_size_bytes"] == len(test_data)
+    assert gzip.decompress((tmp_path / "file.txt.gz").read_bytes()) == test_data
 
     # Test with output path specified
-    result = await handler.compress_file("/path/to/file.txt", "/path/to/output.gz")
-    assert result["compressed_file"] == "/path/to/output.gz"
+    output_path = tmp_path / "output.gz"
+    result = await compression_handler.compress_file(str(file_path), str(output_path))
+    assert result["compressed_file"] == str(output_path)
+    assert result["compressed_size_bytes"] == output_path.stat().st_size
+
+    # Test with zlib
+    result = await compression_handler.compress_file(str(file_path), algorithm="zlib")
+    assert zlib.decompress((tmp_path / "file.txt.zz").read_bytes()) == test_data
+
+    # Existing output is kept unless overwriting is asked for
+    with pytest.raises(FileExistsError):
+        await compression_handler.compress_file(str(file_path), str(output_path))
+    result = await compression_handler.compress_file(str(file_path), str(output_path),
+                                                     overwrite=True)
+    assert gzip.decompress(output_path.read_bytes()) == test_data
+
+    # Test compressing a file onto itself, which must leave it intact
+    with pytest.raises(ValueError):
+        await compression_handler.compress_file(str(file_path), str(file_path), overwrite=True)
+    assert file_path.read_bytes() == test_data
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "file.txt", "file.txt.gz", "file.txt.zz", "output.gz"]
 
     # Test with invalid file path
     with pytest.raises(FileNotFoundError):
-        await handler.compress_file("/nonexistent/file.txt")
+        await compression_handler.compress_file(str(tmp_path / "nonexistent.txt"))
 
     # Test with empty file path
     with pytest.raises(ValueError):
-        await handler.compress_file("")
+        await compression_handler.compress_file("")
+
+
+@pytest.mark.asyncio
+async def test_compression_compress_file_confinement(tmp_path):
+    """Test that compress_file only reads and writes under its base path."""
+    base_path = tmp_path / "data"
+    base_path.mkdir()
+    compression_handler = CompressionHandler(base_path=str(base_path))
+    (base_path / "file.txt").write_bytes(b"inside " * 100)
+    (tmp_path / "secret.txt").write_bytes(b"outside " * 100)
+    (base_path / "link.txt").symlink_to(tmp_path / "secret.txt")
+    (base_path / "out").symlink_to(tmp_path)
+
+    # Relative paths resolve under the base path
+    result = await compression_handler.compress_file("file.txt", "file.gz")
+    assert result["compressed_file"] == str(base_path / "file.gz")
+
+    for file_path in (str(tmp_path / "secret.txt"), "../secret.txt", "link.txt", "/etc/hostname"):
+        with pytest.raises(PermissionError):
+            await compression_handler.compress_file(file_path)
+
+    for output_path in (str(tmp_path / "file.gz"), "../file.gz", "out/file.gz",
+                        str(tmp_path / "secret.txt")):
+        with pytest.raises(PermissionError):
+            await compression_handler.compress_file("file.txt", output_path, overwrite=True)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["data", "secret.txt"]
+    assert (tmp_path / "secret.txt").read_bytes() == b"outside " * 100
 
 
 @pytest.mark.asyncio
-async def test_compression_decompress_data():
+async def test_compression_decompress_data(compression_handler):
     """Test decompressing data."""
-    handler = CompressionHandler()
 
     # First compress some data to get valid compressed data
     test_data = "This is some test data to decompress. " * 10
-    compress_result = await handler.compress_data(test_data, "gzip")
+    compress_result = await compression_handler.compress_data(test_data, "gzip",
+                                                              include_full_data=True)
 
     # Now test decompression
-    decompress_result = await handler.decompress_data(
+    decompress_result = await compression_handler.decompress_data(
             compress_result["full_compressed_data_b64"],
             "gzip"
             )
@@ -124,9 +202,253 @@ async def test_compression_decompress_data():
 
     # Test with empty data
     with pytest.raises(ValueError):
-        await handler.decompress_data("", "gzip")
+        await compression_handler.decompress_data("", "gzip")
 
     # Test with invalid algorithm
     with pytest.raises(ValueError):
-        await handler.decompress_data(compress_result["full_compressed_data_b64"],
-                                      "invalid_algo")
+        await compression_handler.decompress_data(compress_result["full_compressed_data_b64"],
+                                                  "invalid_algo")
+
+
+@pytest.mark.asyncio
+async def test_compression_iter_decompress_data(compression_handler):
+    """Test streaming decompression of a payload spanning several chunks."""
+    test_data = "".join(f"line {i}: caf\u00e9 data\n" for i in range(20000))
+
+    for algorithm in ("gzip", "zlib"):
+        compress_result = await compression_handler.compress_data(test_data, algorithm,
+                                                                  include_full_data=True)
+        compressed_b64 = compress_result["full_compressed_data_b64"]
+
+        chunks = [chunk async for chunk in compression_handler.iter_decompress_data(compressed_b64, algorithm)]
+        assert "".join(chunks) == test_data
+
+        # Line-wrapped base64 is accepted as well
+        wrapped_b64 = "\n".join(compressed_b64[i:i + 76] for i in range(0, len(compressed_b64), 76))
+        result = await compression_handler.decompress_data(wrapped_b64, algorithm)
+        assert result["full_decompressed_data"] == test_data
+        assert result["decompressed_size_bytes"] == len(test_data.encode())
+
+    # Characters outside the base64 alphabet are discarded wherever they are,
+    # as a whole-string decode would, without shifting later chunks
+    test_data = random.Random(0).randbytes(60000).hex()
+    compressed_b64 = base64.b64encode(gzip.compress(test_data.encode())).decode()
+    assert len(compressed_b64) > 65536
+    for stray in ("!", "-", "\x00"):
+        corrupted_b64 = f"{compressed_b64[:1000]}{stray}{compressed_b64[1000:]}"
+        result = await compression_handler.decompress_data(corrupted_b64, "gzip")
+        assert result["full_decompressed_data"] == test_data, repr(stray)
+
+    # Concatenated gzip members are all decompressed
+    members = gzip.compress(b"first ") + gzip.compress(b"second")
+    result = await compression_handler.decompress_data(base64.b64encode(members).decode(), "gzip")
+    assert result["full_decompressed_data"] == "first second"
+
+    # Truncated data is rejected
+    with pytest.raises(ValueError):
+        await compression_handler.decompress_data(base64.b64encode(members[:10]).decode(), "gzip")
+
+
+@pytest.mark.asyncio
+async def test_compression_zstd(tmp_path, compression_handler):
+    """Test compressing and decompressing with zstd."""
+    zstd = pytest.importorskip("zstandard")
+    test_data = "This is some test data to compress with zstd. " * 10
+
+    result = await compression_handler.compress_data(test_data, "zstd", include_full_data=True)
+    assert result["algorithm"] == "zstd"
+    assert result["original_size_bytes"] > result["compressed_size_bytes"]
+
+    decompress_result = await compression_handler.decompress_data(result["full_compressed_data_b64"], "ZSTD")
+    assert decompress_result["full_decompressed_data"] == test_data
+
+    file_path = tmp_path / "file.txt"
+    file_path.write_text(test_data)
+    result = await CompressionHandler(base_path=str(tmp_path)).compress_file(str(file_path),
+                                                                             algorithm="zstd")
+    assert result["compressed_file"] == f"{file_path}.zst"
+    compressed = (tmp_path / "file.txt.zst").read_bytes()
+    assert zstd.ZstdDecompressor().decompressobj().decompress(compressed) == test_data.encode()
+
+
+@pytest.mark.asyncio
+async def test_compression_iter_decompress_zstd_concurrent(compression_handler):
+    """Test that interleaved zstd streams do not share decompression state."""
+    pytest.importorskip("zstandard")
+    # Hex of random bytes barely compresses, so each stream spans many chunks
+    payloads = [random.Random(seed).randbytes(200_000).hex() for seed in (1, 2)]
+    streams = []
+    for payload in payloads:
+        result = await compression_handler.compress_data(payload, "zstd", include_full_data=True)
+        streams.append(compression_handler.iter_decompress_data(result["full_compressed_data_b64"],
+                                                                "zstd"))
+
+    # Alternate between the streams so their steps share worker threads
+    outputs = [[], []]
+    active = {0, 1}
+    while active:
+        for index in sorted(active):
+            try:
+                outputs[index].append(await streams[index].__anext__())
+            except StopAsyncIteration:
+                active.discard(index)
+
+    assert ["".join(output) for output in outputs] == payloads
+
+
+@pytest.mark.asyncio
+async def test_compression_decompress_stream_on_chunk_boundary(compression_handler):
+    """Test a stream that ends exactly where a 64 KiB base64 chunk ends."""
+    zstd = pytest.importorskip("zstandard")
+    # ASCII text that barely compresses, so sizes track the input closely
+    text = base64.b64encode(random.Random(0).randbytes(60000))
+
+    compressors = {
+            "gzip": lambda data: gzip.compress(data, compresslevel=0),
+            "zstd": lambda data: zstd.ZstdCompressor(level=1).compress(data)
+            }
+    for algorithm, compress in compressors.items():
+        # Find the input length whose stream fills exactly 49152 bytes,
+        # i.e. 65536 base64 characters
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high) // 2
+            if len(compress(text[:middle])) < 49152:
+                low = middle + 1
+            else:
+                high = middle
+        first_stream = compress(text[:low])
+        assert len(first_stream) == 49152
+
+        payload = first_stream + compress(b"tail")
+        result = await compression_handler.decompress_data(base64.b64encode(payload).decode(),
+                                                           algorithm)
+        assert result["full_decompressed_data"] == text[:low].decode() + "tail"
+
+
+@pytest.mark.asyncio
+async def test_slurm_status_batcher():
+    """Test that concurrent job status lookups share one batch query."""
+    handler = SlurmHandler()
+    batcher = SlurmStatusBatcher(handler)
+    job_id = (await handler.submit_job("/path/to/job.sh"))["job_id"]
+
+    batch_calls = []
+    get_job_status_batch = handler.get_job_status_batch
+
+    async def counting_batch(job_ids):
+        batch_calls.append(job_ids)
+        return await get_job_status_batch(job_ids)
+
+    handler.get_job_status_batch = counting_batch
+
+    results = await asyncio.gather(batcher.get_job_status(job_id),
+                                   batcher.get_job_status("missing"),
+                                   batcher.get_job_status(job_id))
+
+    assert batch_calls == [[job_id, "missing"]]
+    assert results[0]["job_id"] == job_id
+    assert results[0] is results[2]
+    assert results[1]["state"] == "UNKNOWN"
+
+    with pytest.raises(ValueError):
+        await batcher.get_job_status("")
+
+
+@pytest.mark.asyncio
+async def test_hdf5_read_dataset_from_file(tmp_path):
+    """Test reading a dataset from an HDF5 file on disk."""
+    handler = HDF5Handler(base_path=str(tmp_path))
+    file_path = tmp_path / "sample.h5"
+    with h5py.File(file_path, "w") as hdf5_file:
+        dataset = hdf5_file.create_dataset("group1/temperature", data=np.array([20.1, 20.3, 20.8]))
+        dataset.attrs["unit"] = "celsius"
+
+    result = await handler.read_dataset(str(file_path), "group1/temperature")
+    assert result["data"] == [20.1, 20.3, 20.8]
+    assert result["shape"] == (3,)
+    assert result["dtype"] == "float64"
+    assert result["attributes"] == {"unit": "celsius"}
+    assert "simulated" not in result
+
+    # Repeated reads reuse the open file and cached dataset handle
+    open_file = handler._file_cache[str(file_path)]
+    await handler.read_dataset(str(file_path), "group1/temperature")
+    assert handler._file_cache[str(file_path)] is open_file
+    assert list(open_file.datasets) == ["group1/temperature"]
+
+    # Test with a missing dataset
+    with pytest.raises(ValueError):
+        await handler.read_dataset(str(file_path), "group1/missing")
+
+    # A file replaced on disk is reopened rather than served stale
+    new_path = tmp_path / "new.h5"
+    with h5py.File(new_path, "w") as hdf5_file:
+        hdf5_file.create_dataset("group1/temperature", data=np.array([1.5]))
+    new_path.replace(file_path)
+    result = await handler.read_dataset(str(file_path), "group1/temperature")
+    assert result["data"] == [1.5]
+    assert not open_file.file.id.valid
+
+    handler.close()
+
+
+@pytest.mark.asyncio
+async def test_hdf5_open_file_limit(tmp_path):
+    """Test that the least recently used HDF5 file is closed past the limit."""
+    handler = HDF5Handler(base_path=str(tmp_path), max_open_files=2)
+    paths = []
+    for index in range(3):
+        file_path = tmp_path / f"sample{index}.h5"
+        with h5py.File(file_path, "w") as hdf5_file:
+            hdf5_file.create_dataset("values", data=np.arange(index + 1))
+        paths.append(str(file_path))
+
+    await handler.read_dataset(paths[0], "values")
+    first_file = handler._file_cache[paths[0]].file
+    for file_path in paths[1:]:
+        await handler.read_dataset(file_path, "values")
+
+    assert list(handler._file_cache) == paths[1:]
+    assert not first_file.id.valid
+
+    # An evicted file can still be read, and reopening it evicts the next one
+    result = await handler.read_dataset(paths[0], "values")
+    assert result["data"] == [0]
+    assert list(handler._file_cache) == [paths[2], paths[0]]
+
+    handler.close()
+
+
+@pytest.mark.asyncio
+async def test_hdf5_read_dataset_confinement(tmp_path):
+    """Test that reads are confined to the base path and allowed remote hosts."""
+    base_path = tmp_path / "samples"
+    base_path.mkdir()
+    handler = HDF5Handler(base_path=str(base_path), remote_allowlist=["s3://my-bucket"])
+    for file_path in (tmp_path / "secret.h5", base_path / "sample.h5"):
+        with h5py.File(file_path, "w") as hdf5_file:
+            hdf5_file.create_dataset("metadata", data=np.arange(3))
+    (base_path / "link.h5").symlink_to(tmp_path / "secret.h5")
+
+    # Relative paths resolve under the base path
+    result = await handler.read_dataset("sample.h5", "metadata")
+    assert result["data"] == [0, 1, 2]
+
+    for file_path in (f"{base_path}/../secret.h5", "../secret.h5", str(tmp_path / "secret.h5"),
+                      str(base_path / "link.h5"), "/etc/passwd"):
+        with pytest.raises(PermissionError):
+            await handler.read_dataset(file_path, "metadata")
+
+    for url in ("file:///etc/passwd", "http://169.254.169.254/latest/meta-data",
+                "s3://other-bucket/data.h5", "s3://my-bucket@evil.example/data.h5",
+                "simplecache::s3://my-bucket/data.h5"):
+        with pytest.raises(PermissionError):
+            await handler.read_dataset(url, "metadata")
+    handler._check_remote_allowed("S3://my-bucket/data.h5")
+
+    # Remote reads are off unless an allowlist is configured
+    with pytest.raises(PermissionError):
+        await HDF5Handler().read_dataset("s3://my-bucket/data.h5", "metadata")
+
+    handler.close()
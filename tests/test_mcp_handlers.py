@@ -1,11 +1,18 @@
 import pytest
 import asyncio
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from src.mcp_handlers import (
         handle_list_resources,
         handle_list_tools,
         handle_get_resource,
-        handle_call_tool
+        handle_call_tool,
+        handle_call_tool_batch,
+        handle_call_tool_sync,
+        _CONCURRENCY_LIMITS
         )
+from src.async_loop import get_loop_thread
+from src import mcp_handlers
 
 
 @pytest.mark.asyncio
@@ -23,6 +30,33 @@ async def test_handle_list_resources():
     assert "type" in resource
     assert resource["type"] == "hdf5"
 
+    # Repeated calls within the TTL are served from the cache
+    again = await handle_list_resources({})
+    assert again["resources"] is result["resources"]
+
+
+@pytest.mark.asyncio
+async def test_handle_list_resources_refresh_on_two_loops(monkeypatch):
+    """Test concurrent cache refreshes on the sync bridge loop and this loop."""
+    list_available_resources = mcp_handlers.hdf5_handler.list_available_resources
+
+    async def slow_list_available_resources():
+        await asyncio.sleep(0.01)
+        return await list_available_resources()
+
+    monkeypatch.setattr(mcp_handlers.hdf5_handler, "list_available_resources",
+                        slow_list_available_resources)
+    # Expire the cache on every call, so each one refreshes under the lock
+    monkeypatch.setattr(mcp_handlers, "_RESOURCES_TTL_SECONDS", 0)
+
+    async def refresh_burst():
+        return await asyncio.gather(*(handle_list_resources({}) for _ in range(3)))
+
+    bridge = asyncio.wrap_future(get_loop_thread().submit(refresh_burst()))
+    local, bridged = await asyncio.wait_for(asyncio.gather(refresh_burst(), bridge), timeout=10)
+
+    assert all(result["resources"] for result in local + bridged)
+
 
 @pytest.mark.asyncio
 async def test_handle_list_tools():
@@ -45,6 +79,12 @@ async def test_handle_list_tools():
     assert "parameters" in tool
     assert "returns" in tool
 
+    # Changing a result does not leak into later calls or the served catalog
+    result["tools"].clear()
+    tool["parameters"].clear()
+    again = await handle_list_tools({})
+    assert orjson.dumps(again) == mcp_handlers.TOOLS_JSON
+
 
 @pytest.mark.asyncio
 async def test_handle_get_resource():
@@ -137,3 +177,121 @@ async def test_handle_call_tool_invalid():
 
     with pytest.raises(ValueError):
         await handle_call_tool({})
+
+
+@pytest.mark.asyncio
+async def test_handle_call_tool_slurm_status_batch():
+    """Test calling the Slurm get_job_status_batch tool."""
+    submit_result = await handle_call_tool({
+        "id": "slurm.submit_job",
+        "parameters": {
+            "script_path": "/path/to/job.sh"
+            }
+        })
+
+    job_id = submit_result["result"]["job_id"]
+
+    result = await handle_call_tool({
+        "id": "slurm.get_job_status_batch",
+        "parameters": {
+            "job_ids": [job_id, "missing"]
+            }
+        })
+
+    jobs = result["result"]["jobs"]
+    assert [job["job_id"] for job in jobs] == [job_id, "missing"]
+    assert jobs[1]["state"] == "UNKNOWN"
+
+    # A bare string is not a list of job IDs
+    for job_ids in ("12345", [job_id, ""], [12345]):
+        with pytest.raises(ValueError):
+            await handle_call_tool({
+                "id": "slurm.get_job_status_batch",
+                "parameters": {"job_ids": job_ids}
+                })
+
+
+@pytest.mark.asyncio
+async def test_handle_call_tool_batch():
+    """Test executing several tool calls in one request."""
+    result = await handle_call_tool_batch({
+        "calls": [
+            {"id": "hdf5.list_contents", "parameters": {"file_path": "/path/to/sample.h5"}},
+            {"id": "invalid.tool", "parameters": {}},
+            {"id": "node.get_cpu_info", "parameters": {}}
+            ]
+        })
+
+    results = result["results"]
+    assert len(results) == 3
+    assert "groups" in results[0]["result"]
+    assert "invalid.tool" in results[1]["error"]["message"]
+    assert "cpu_count" in results[2]["result"]
+
+    for params in ({}, {"calls": "bad"}, {"calls": ["bad"]}):
+        with pytest.raises(ValueError):
+            await handle_call_tool_batch(params)
+
+
+def test_handle_call_tool_sync():
+    """Test calling tools from several threads through the shared loop."""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(handle_call_tool_sync, [
+            {"id": "hdf5.list_contents", "parameters": {"file_path": "/path/to/sample.h5"}}
+            ] * 4))
+
+    assert all("groups" in result["result"] for result in results)
+
+    # Contend the compression limit from sync callers on the shared loop while
+    # another loop in this thread contends it too
+    calls = [{"id": "compression.compress_data", "parameters": {"data": "y" * 100_000}}
+             ] * (_CONCURRENCY_LIMITS["compression"] + 2)
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        sync_results = executor.map(handle_call_tool_sync, calls, timeout=10)
+        async_results = asyncio.run(asyncio.wait_for(_compress_burst(), timeout=10))
+        sync_results = list(sync_results)
+
+    for result in sync_results + async_results:
+        assert result["result"]["original_size_bytes"] == 100_000
+
+    with pytest.raises(ValueError):
+        handle_call_tool_sync({"id": "invalid.tool"})
+
+
+@pytest.mark.asyncio
+async def test_handle_call_tool_slurm_status_sync_and_async_overlap():
+    """Test status lookups from the sync bridge while this loop has a batch open."""
+    pending = asyncio.ensure_future(handle_call_tool({
+        "id": "slurm.get_job_status",
+        "parameters": {"job_id": "12345"}
+        }))
+    # Let the async lookup open its batch window on this loop
+    await asyncio.sleep(0)
+
+    result = await asyncio.wait_for(asyncio.to_thread(handle_call_tool_sync, {
+        "id": "slurm.get_job_status",
+        "parameters": {"job_id": "67890"}
+        }), timeout=3)
+
+    assert result["result"]["job_id"] == "67890"
+    assert (await pending)["result"]["job_id"] == "12345"
+
+
+async def _compress_burst():
+    """Make more concurrent compression calls than the capability allows."""
+    return await asyncio.gather(*(handle_call_tool({
+        "id": "compression.compress_data",
+        "parameters": {"data": "x" * 100_000}
+        }) for _ in range(_CONCURRENCY_LIMITS["compression"] + 2)))
+
+
+@pytest.mark.asyncio
+async def test_capability_limits_per_event_loop():
+    """Test contending a capability limit on the sync bridge loop and this loop."""
+    bridge = asyncio.wrap_future(get_loop_thread().submit(_compress_burst()))
+    local, bridged = await asyncio.wait_for(asyncio.gather(_compress_burst(), bridge), timeout=10)
+    # A third loop, started after the others have already waited on the limit
+    started = await asyncio.wait_for(asyncio.to_thread(asyncio.run, _compress_burst()), timeout=10)
+
+    for result in local + bridged + started:
+        assert result["result"]["original_size_bytes"] == 100_000
@@ -0,0 +1,90 @@
+import pytest
+from fastapi.testclient import TestClient
+from src.server import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Test client for the MCP server app."""
+    return TestClient(app)
+
+
+def test_invalid_request_message_is_bounded(client):
+    """Test that validation errors do not echo unbounded client input."""
+    response = client.post("/mcp", json={"jsonrpc": "x" * 1_000_000, "method": "mcp/listTools",
+                                         "id": 1})
+
+    assert response.status_code == 400
+    error = response.json()["error"]
+    assert error["code"] == -32600
+    assert error["message"].startswith("Invalid Request: Invalid enum value")
+    assert len(error["message"]) < 300
+
+
+def _list_tools(client, request_id=1, **headers):
+    """Post an mcp/listTools request."""
+    return client.post("/mcp", json={"jsonrpc": "2.0", "method": "mcp/listTools", "id": request_id},
+                       headers=headers)
+
+
+def test_list_tools_etag(client):
+    """Test conditional mcp/listTools requests."""
+    response = _list_tools(client)
+    assert response.status_code == 200
+    assert response.json()["id"] == 1
+    assert response.json()["result"]["tools"]
+    etag = response.headers["etag"]
+
+    for if_none_match in (etag, f"W/{etag}", f'"stale", {etag}', f'"stale",W/{etag} ', "*"):
+        response = _list_tools(client, **{"If-None-Match": if_none_match})
+        assert response.status_code == 304, if_none_match
+        assert response.headers["etag"] == etag
+        assert not response.content
+
+    for if_none_match in ('"stale"', 'W/"stale", "other"', etag.strip('"'), ""):
+        response = _list_tools(client, **{"If-None-Match": if_none_match})
+        assert response.status_code == 200, if_none_match
+        assert response.headers["etag"] == etag
+
+
+def test_batch_preserves_order_with_mixed_errors(client):
+    """Test that batch responses keep request order and fail per element."""
+    response = client.post("/mcp", json=[
+        {"jsonrpc": "2.0", "method": "mcp/listTools", "id": "a"},
+        {"jsonrpc": "2.0", "method": "mcp/unknown", "id": 2},
+        {"jsonrpc": "2.0", "id": 3},
+        {"jsonrpc": "2.0", "method": "mcp/listResources", "id": 4}
+        ])
+
+    assert response.status_code == 200
+    responses = response.json()
+    assert len(responses) == 4
+    assert responses[0]["id"] == "a"
+    assert "tools" in responses[0]["result"]
+    assert responses[1] == {"jsonrpc": "2.0", "id": 2,
+                            "error": {"code": -32601, "message": "Method 'mcp/unknown' not found"}}
+    assert responses[2]["error"]["code"] == -32600
+    assert "method" in responses[2]["error"]["message"]
+    assert responses[3]["id"] == 4
+    assert "resources" in responses[3]["result"]
+
+
+def test_invalid_request_bodies(client):
+    """Test the -32600 and -32700 error responses."""
+    response = client.post("/mcp", json={"jsonrpc": "2.0", "id": 1})
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == -32600
+    assert "method" in response.json()["error"]["message"]
+
+    response = client.post("/mcp", json={"jsonrpc": "1.0", "method": "mcp/listTools", "id": 1})
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == -32600
+
+    response = client.post("/mcp", json=[])
+    assert response.status_code == 400
+    assert response.json() == {"error": {"code": -32600, "message": "Invalid Request: Empty batch"}}
+
+    response = client.post("/mcp", content=b'{"jsonrpc": "2.0",',
+                           headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+    assert response.json() == {"error": {"code": -32700, "message": "Parse error: Invalid JSON"}}